@@ -0,0 +1,94 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pages.cart_page import CartPage
+from utils.driver_factory import DriverFactory
+from utils.driver_resolver import resolve_driver_path
+from utils.logger import get_logger
+
+from bench_common import load_config
+
+logger = get_logger(__name__)
+
+
+ROW_TEMPLATE = """
+<tr>
+  <td class="text-center"><img src="" alt=""></td>
+  <td class="text-left"><a href="#product-{index}">Product {index}</a></td>
+  <td class="text-left">Model {index}</td>
+  <td class="text-left"><input type="text" name="quantity[{index}]" value="1"></td>
+  <td class="text-right">${index}.00</td>
+  <td class="text-right">${index}.00</td>
+</tr>"""
+
+
+def write_cart_page(rows):
+    # Same table structure as the OpenCart cart so CartPage locators match
+    body = "".join(ROW_TEMPLATE.format(index=index) for index in range(rows))
+    html = (
+        "<html><body><div id='content'><div class='table-responsive'><table>"
+        f"<tbody>{body}</tbody></table></div></div></body></html>"
+    )
+    handle, path = tempfile.mkstemp(suffix=".html")
+    with os.fdopen(handle, 'w') as f:
+        f.write(html)
+    return path
+
+
+def time_runs(func, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-element and bulk list extraction")
+    parser.add_argument("--browser", default="chrome")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    
+    config = load_config()
+    path = write_cart_page(args.rows)
+    driver = DriverFactory.create_driver(
+        args.browser,
+        headless=True,
+        profile=DriverFactory.get_profile("lean", config),
+        driver_path=resolve_driver_path(args.browser, config)
+    )
+    
+    try:
+        DriverFactory.configure_driver(driver)
+        driver.get(f"file://{path}")
+        cart_page = CartPage(driver)
+        
+        per_element, expected = time_runs(
+            lambda: [elem.text for elem in driver.find_elements(*CartPage.PRODUCT_NAMES)],
+            args.runs
+        )
+        bulk, names = time_runs(lambda: cart_page.get_texts(CartPage.PRODUCT_NAMES), args.runs)
+        
+        if names != expected:
+            logger.warning("Bulk extraction returned different texts than element.text")
+    finally:
+        driver.quit()
+        os.remove(path)
+    
+    print(f"\n{args.rows} rows, {args.runs} runs")
+    print(f"{'method':<14}{'median (s)':>14}{'max (s)':>12}")
+    for name, timings in (("per element", per_element), ("bulk", bulk)):
+        print(f"{name:<14}{statistics.median(timings):>14.4f}{max(timings):>12.4f}")
+    print(f"speedup: {statistics.median(per_element) / statistics.median(bulk):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+from itertools import cycle, islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pages.cart_page import CartPage
+from utils.driver_factory import DriverFactory
+from utils.driver_resolver import resolve_driver_path
+from utils.logger import get_logger
+
+from bench_common import load_config
+
+logger = get_logger(__name__)
+
+
+# Demo store products that can be added without choosing options
+DEFAULT_PRODUCT_IDS = [28, 29, 31, 32, 33, 34, 36, 40, 41, 43, 44, 45, 46, 48, 49]
+
+ADD_TO_CART_SCRIPT = """
+const [url, productIds] = arguments;
+const done = arguments[arguments.length - 1];
+(async () => {
+    for (const productId of productIds) {
+        await fetch(url, {
+            method: 'POST',
+            credentials: 'same-origin',
+            headers: {'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8'},
+            body: 'quantity=1&product_id=' + productId
+        });
+    }
+})().then(() => done(true), () => done(false));
+"""
+
+
+def remove_one_by_one(cart_page):
+    # The loop remove_all_products used before the bulk reset
+    while cart_page.get_cart_items_count() > 0:
+        cart_page.remove_product(0)
+    return cart_page.is_cart_empty()
+
+
+def fill_cart(driver, base_url, product_ids, items):
+    driver.execute_async_script(
+        ADD_TO_CART_SCRIPT,
+        f"{base_url}/index.php?route=checkout/cart/add",
+        list(islice(cycle(product_ids), items))
+    )
+    cart_page = CartPage(driver)
+    cart_page.navigate_to(CartPage.CART_URL)
+    return cart_page
+
+
+def time_reset(driver, base_url, product_ids, items, reset, runs):
+    timings = []
+    rows = 0
+    for _ in range(runs):
+        cart_page = fill_cart(driver, base_url, product_ids, items)
+        rows = cart_page.get_cart_items_count()
+        start = time.perf_counter()
+        if not reset(cart_page):
+            logger.warning(f"Cart not empty after reset ({items} items)")
+        timings.append(time.perf_counter() - start)
+    return timings, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time emptying carts of different sizes")
+    parser.add_argument("--browser", default="chrome")
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--items", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--product-ids", type=int, nargs="+", default=DEFAULT_PRODUCT_IDS,
+                        help="Products to add; repeats raise quantities, so rows are capped "
+                             "at the number of distinct ids")
+    parser.add_argument("--skip-legacy", action="store_true",
+                        help="Only time the bulk reset")
+    args = parser.parse_args()
+    
+    config = load_config()
+    base_url = (args.base_url or config.get("base_url", "https://demo.opencart.com")).rstrip("/")
+    driver = DriverFactory.create_driver(
+        args.browser,
+        headless=True,
+        profile=DriverFactory.get_profile("lean", config),
+        driver_path=resolve_driver_path(args.browser, config)
+    )
+    
+    results = []
+    try:
+        DriverFactory.configure_driver(driver)
+        driver.base_url = base_url
+        driver.get(base_url)
+        
+        for items in args.items:
+            bulk, rows = time_reset(
+                driver, base_url, args.product_ids, items,
+                lambda page: page.remove_all_products(), args.runs
+            )
+            legacy = None
+            if not args.skip_legacy:
+                legacy, _ = time_reset(
+                    driver, base_url, args.product_ids, items, remove_one_by_one, args.runs
+                )
+            results.append((items, rows, bulk, legacy))
+    finally:
+        driver.quit()
+    
+    print(f"\n{'items':>6}{'rows':>6}{'bulk median (s)':>18}{'one by one median (s)':>24}")
+    for items, rows, bulk, legacy in results:
+        legacy_median = f"{statistics.median(legacy):.3f}" if legacy else "n/a"
+        print(f"{items:>6}{rows:>6}{statistics.median(bulk):>18.3f}{legacy_median:>24}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.driver_factory import PERFORMANCE_PROFILES, DriverFactory
+from utils.driver_resolver import resolve_driver_path
+from utils.logger import get_logger
+
+from bench_common import load_config
+
+logger = get_logger(__name__)
+
+
+def browser_rss_mb(driver):
+    try:
+        import psutil
+    except ImportError:
+        return None
+    
+    try:
+        service_process = psutil.Process(driver.service.process.pid)
+        processes = [service_process] + service_process.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+    except (psutil.Error, AttributeError):
+        return None
+
+
+def bench_profile(browser, profile, url, runs, config):
+    startup_times = []
+    rss_values = []
+    
+    for _ in range(runs):
+        start = time.perf_counter()
+        driver = DriverFactory.create_driver(
+            browser,
+            headless=True,
+            profile=profile,
+            driver_path=resolve_driver_path(browser, config)
+        )
+        DriverFactory.configure_driver(driver)
+        startup_times.append(time.perf_counter() - start)
+        
+        try:
+            if url:
+                driver.get(url)
+            rss = browser_rss_mb(driver)
+            if rss is not None:
+                rss_values.append(rss)
+        finally:
+            driver.quit()
+    
+    return {
+        "profile": profile["name"],
+        "startup_median_s": statistics.median(startup_times),
+        "startup_max_s": max(startup_times),
+        "rss_median_mb": statistics.median(rss_values) if rss_values else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark browser startup time and RSS per profile"
+    )
+    parser.add_argument("--browser", default="chrome")
+    parser.add_argument("--profiles", nargs="+", default=sorted(PERFORMANCE_PROFILES))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--url", default="https://demo.opencart.com",
+                        help="Page loaded before RSS is sampled (empty string to skip)")
+    args = parser.parse_args()
+    
+    config = load_config()
+    results = []
+    for name in args.profiles:
+        profile = DriverFactory.get_profile(name, config)
+        logger.info(f"Benchmarking profile: {name}")
+        results.append(bench_profile(args.browser, profile, args.url, args.runs, config))
+    
+    print(f"\n{'profile':<12}{'startup median (s)':>20}"
+          f"{'startup max (s)':>18}{'RSS median (MB)':>18}")
+    for result in results:
+        rss = f"{result['rss_median_mb']:.1f}" if result["rss_median_mb"] is not None else "n/a"
+        print(f"{result['profile']:<12}{result['startup_median_s']:>20.3f}"
+              f"{result['startup_max_s']:>18.3f}{rss:>18}")
+    
+    if any(result["rss_median_mb"] is None for result in results):
+        print("\nInstall psutil to collect RSS figures")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pages.checkout_page import CheckoutPage
+from utils.driver_factory import DriverFactory
+from utils.driver_resolver import resolve_driver_path
+from utils.logger import get_logger
+
+from bench_common import load_config
+
+logger = get_logger(__name__)
+
+
+BILLING_DETAILS = {
+    "first_name": "Test",
+    "last_name": "User",
+    "email": "test.user@example.com",
+    "telephone": "1234567890",
+    "address": "1 Test Street",
+    "city": "London",
+    "postcode": "SW1A 1AA",
+    "country": "United Kingdom",
+    "region": "Kent"
+}
+
+# Billing step of the OpenCart guest checkout with the same element ids
+FORM_HTML = """
+<html><body><div id="content">
+  <input type="radio" name="account" value="guest">
+  <input id="input-payment-firstname"><input id="input-payment-lastname">
+  <input id="input-payment-email"><input id="input-payment-telephone">
+  <input id="input-payment-address-1"><input id="input-payment-city">
+  <input id="input-payment-postcode">
+  <select id="input-payment-country">
+    <option value="">--- Please Select ---</option>
+    <option value="222">United Kingdom</option><option value="223">United States</option>
+  </select>
+  <select id="input-payment-zone"><option value="">--- Please Select ---</option></select>
+  <input type="button" id="button-guest" value="Continue">
+</div>
+<script>
+  // Stands in for the zone AJAX call made when the country changes
+  document.getElementById('input-payment-country').addEventListener('change', () => {
+    setTimeout(() => {
+      document.getElementById('input-payment-zone').innerHTML =
+        '<option value="">--- Please Select ---</option><option value="3553">Kent</option>';
+    }, 50);
+  });
+</script>
+</body></html>
+"""
+
+
+def fill_with_keystrokes(page, details):
+    # The per-field implementation fill_billing_details used before fill_form
+    page.send_keys_to_element(page.FIRST_NAME_INPUT, details["first_name"])
+    page.send_keys_to_element(page.LAST_NAME_INPUT, details["last_name"])
+    page.send_keys_to_element(page.EMAIL_INPUT, details["email"])
+    page.send_keys_to_element(page.TELEPHONE_INPUT, details["telephone"])
+    page.send_keys_to_element(page.ADDRESS_INPUT, details["address"])
+    page.send_keys_to_element(page.CITY_INPUT, details["city"])
+    page.send_keys_to_element(page.POSTCODE_INPUT, details["postcode"])
+    page.select_dropdown_by_text(page.COUNTRY_DROPDOWN, details["country"], native=True)
+    page.wait_helper.wait_for_text_in_element(page.REGION_DROPDOWN, details["region"], timeout=5)
+    page.select_dropdown_by_text(page.REGION_DROPDOWN, details["region"], native=True)
+
+
+def fill_with_form(page, details):
+    page.fill_form({
+        page.FIRST_NAME_INPUT: details["first_name"],
+        page.LAST_NAME_INPUT: details["last_name"],
+        page.EMAIL_INPUT: details["email"],
+        page.TELEPHONE_INPUT: details["telephone"],
+        page.ADDRESS_INPUT: details["address"],
+        page.CITY_INPUT: details["city"],
+        page.POSTCODE_INPUT: details["postcode"],
+        page.COUNTRY_DROPDOWN: details["country"],
+        page.REGION_DROPDOWN: details["region"]
+    })
+
+
+def time_fill(driver, url, fill, runs):
+    timings = []
+    for _ in range(runs):
+        driver.get(url)
+        page = CheckoutPage(driver)
+        start = time.perf_counter()
+        fill(page, BILLING_DETAILS)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-field typing and fill_form")
+    parser.add_argument("--browser", default="chrome")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    
+    config = load_config()
+    handle, path = tempfile.mkstemp(suffix=".html")
+    with os.fdopen(handle, 'w') as f:
+        f.write(FORM_HTML)
+    
+    driver = DriverFactory.create_driver(
+        args.browser,
+        headless=True,
+        profile=DriverFactory.get_profile("lean", config),
+        driver_path=resolve_driver_path(args.browser, config)
+    )
+    
+    try:
+        DriverFactory.configure_driver(driver, implicit_wait=0)
+        url = f"file://{path}"
+        keystrokes = time_fill(driver, url, fill_with_keystrokes, args.runs)
+        batched = time_fill(driver, url, fill_with_form, args.runs)
+    finally:
+        driver.quit()
+        os.remove(path)
+    
+    print(f"\nBilling form, {args.runs} runs")
+    print(f"{'method':<14}{'median (s)':>14}{'max (s)':>12}")
+    for name, timings in (("keystrokes", keystrokes), ("fill_form", batched)):
+        print(f"{name:<14}{statistics.median(timings):>14.4f}{max(timings):>12.4f}")
+    print(f"speedup: {statistics.median(keystrokes) / statistics.median(batched):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
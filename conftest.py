@@ -1,20 +1,26 @@
 import json
 import os
+import uuid
 import pytest
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
 
+from pages.login_page import LoginPage
+from utils.driver_factory import DEFAULT_PROFILE, DriverFactory
+from utils.driver_pool import DriverPool, StandbyDriverPool
+from utils.driver_resolver import get_resolver, resolve_driver_path
+from utils.latency_store import LatencyStore
 from utils.logger import get_logger
+from utils.network_blocker import NetworkBlocker
+from utils.run_metrics import metrics
 from utils.screenshot_helper import capture_screenshot
+from utils.shop_seeder import ShopSeeder, create_http_pool
+from utils.storage_state import StorageStateCache
 
 logger = get_logger(__name__)
 
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config", "config.json")
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -35,21 +41,87 @@ def pytest_addoption(parser):
         default="https://demo.opencart.com",
         help="Base URL for the application under test"
     )
+    parser.addoption(
+        "--reuse-browser",
+        action="store_true",
+        default=False,
+        help="Keep browsers alive per worker and reset their state between tests"
+    )
+    parser.addoption(
+        "--pool-size",
+        action="store",
+        type=int,
+        default=1,
+        help="Number of idle browsers kept per worker when --reuse-browser is set"
+    )
+    parser.addoption(
+        "--standby-browsers",
+        action="store",
+        type=int,
+        default=None,
+        help="Number of browsers each worker pre-launches in the background (0 disables)"
+    )
+    parser.addoption(
+        "--profile",
+        action="store",
+        default=None,
+        help="Browser performance profile from config.json: full, standard or lean"
+    )
+    parser.addoption(
+        "--page-load-strategy",
+        action="store",
+        default=None,
+        choices=["normal", "eager", "none"],
+        help="WebDriver page load strategy; pages then wait for their own ready elements"
+    )
+    parser.addoption(
+        "--implicit-wait",
+        action="store",
+        type=float,
+        default=None,
+        help="Implicit wait in seconds; 0 makes all waiting explicit"
+    )
+    parser.addoption(
+        "--wait-engine",
+        action="store",
+        default=None,
+        choices=["polling", "observer"],
+        help="How explicit waits detect changes: WebDriver polling or a browser-side "
+             "MutationObserver"
+    )
+    parser.addoption(
+        "--adaptive-timeouts",
+        action="store_true",
+        default=False,
+        help="Use per-locator timeouts learned from recorded wait latencies"
+    )
+    parser.addoption(
+        "--element-cache",
+        action="store_true",
+        default=False,
+        help="Let page objects reuse elements they already located until the page changes"
+    )
 
 
 @pytest.fixture(scope="session")
 def config():
-    config_path = os.path.join(os.path.dirname(__file__), "config", "config.json")
-    try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        logger.warning(f"Config file not found at {config_path}, using defaults")
+    config = _load_config()
+    if config is None:
+        logger.warning(f"Config file not found at {CONFIG_PATH}, using defaults")
         return {
             "base_url": "https://demo.opencart.com",
             "implicit_wait": 10,
             "explicit_wait": 20
         }
+    return config
+
+
+def _load_config():
+    try:
+        with open(CONFIG_PATH, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
 
 
 @pytest.fixture(scope="session")
@@ -72,51 +144,172 @@ def test_data():
     return test_data
 
 
-@pytest.fixture(scope="function")
-def driver(request, config):
-    browser = request.config.getoption("--browser").lower()
-    headless = request.config.getoption("--headless")
-    base_url = request.config.getoption("--base-url")
+def _get_profile_name(request, config):
+    marker = request.node.get_closest_marker("driver_profile")
+    if marker is not None and marker.args:
+        return marker.args[0]
+    return (request.config.getoption("--profile")
+            or config.get("performance_profile", DEFAULT_PROFILE))
+
+
+def _get_blocked_urls(request, config):
+    default_patterns = config.get("blocked_urls", [])
+    marker = request.node.get_closest_marker("blocked_urls")
+    if marker is None:
+        return default_patterns
+    
+    if marker.kwargs.get("replace", False):
+        return list(marker.args)
+    return default_patterns + [p for p in marker.args if p not in default_patterns]
+
+
+def _launch_driver(pytest_config, config, profile_name=None):
+    browser = pytest_config.getoption("--browser").lower()
+    headless = pytest_config.getoption("--headless")
+    base_url = pytest_config.getoption("--base-url")
     
-    logger.info(f"Starting {browser} browser (headless: {headless})")
+    profile = DriverFactory.get_profile(profile_name, config)
+    logger.info(f"Starting {browser} browser (headless: {headless}, profile: {profile['name']})")
     
-    driver_instance = None
+    def create_driver():
+        return DriverFactory.create_driver(
+            browser,
+            headless,
+            profile=profile,
+            driver_path=resolve_driver_path(browser, config),
+            blocked_urls=config.get("blocked_urls", []),
+            network_stats=getattr(pytest_config, "blocked_urls_marked", False),
+            page_load_strategy=(
+                pytest_config.getoption("--page-load-strategy")
+                or config.get("page_load_strategy")
+            )
+        )
     
     try:
-        if browser == "chrome":
-            chrome_options = ChromeOptions()
-            if headless:
-                chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--disable-web-security")
-            chrome_options.add_argument("--allow-running-insecure-content")
-            
-            service = ChromeService(ChromeDriverManager().install())
-            driver_instance = webdriver.Chrome(service=service, options=chrome_options)
-            
-        elif browser == "firefox":
-            firefox_options = FirefoxOptions()
-            if headless:
-                firefox_options.add_argument("--headless")
-            firefox_options.add_argument("--width=1920")
-            firefox_options.add_argument("--height=1080")
-            
-            service = FirefoxService(GeckoDriverManager().install())
-            driver_instance = webdriver.Firefox(service=service, options=firefox_options)
-            
+        driver_instance = create_driver()
+    except SessionNotCreatedException as e:
+        # Usually a cached driver that no longer matches an updated browser
+        logger.warning(f"Session not created, resolving the {browser} driver again: {e}")
+        get_resolver(config).invalidate(browser)
+        driver_instance = create_driver()
+    
+    # Configure timeouts
+    implicit_wait = pytest_config.getoption("--implicit-wait")
+    if implicit_wait is None:
+        implicit_wait = config.get("implicit_wait", 10)
+    DriverFactory.configure_driver(
+        driver_instance,
+        implicit_wait=implicit_wait,
+        page_load_timeout=config.get("page_load_timeout", 30),
+        script_timeout=config.get("script_timeout", 30)
+    )
+    
+    # Store base URL for easy access
+    driver_instance.base_url = base_url
+    driver_instance.wait_engine = (
+        pytest_config.getoption("--wait-engine") or config.get("wait_engine", "polling")
+    )
+    driver_instance.cache_elements = (
+        pytest_config.getoption("--element-cache") or config.get("element_cache", False)
+    )
+    
+    return driver_instance
+
+
+@pytest.fixture(scope="session")
+def latency_store(request, config):
+    if not _records_latency(request.config, config):
+        yield None
+        return
+    
+    adaptive = request.config.getoption("--adaptive-timeouts")
+    store = LatencyStore.from_config(
+        config, adaptive=adaptive or None, run_id=_latency_run_id(request.config)
+    )
+    yield store
+    
+    # Regressions are computed once by the controller after every worker has flushed
+    store.flush()
+
+
+def _records_latency(pytest_config, config):
+    return bool(
+        pytest_config.getoption("--adaptive-timeouts")
+        or config.get("wait_latency", {}).get("record", False)
+    )
+
+
+def _latency_run_id(pytest_config):
+    workerinput = getattr(pytest_config, "workerinput", None)
+    if workerinput is not None:
+        return workerinput["wait_latency_run_id"]
+    return pytest_config.wait_latency_run_id
+
+
+@pytest.fixture(scope="session")
+def driver_pools(request, config):
+    reuse_browser = request.config.getoption("--reuse-browser")
+    standby_depth = request.config.getoption("--standby-browsers")
+    if standby_depth is None:
+        standby_depth = config.get("standby_browsers", 0)
+    
+    pools = {}
+    owned = []
+    
+    def get_pool(profile_name):
+        if not reuse_browser and not standby_depth:
+            return None
+        if profile_name in pools:
+            return pools[profile_name]
+        
+        def launcher():
+            return _launch_driver(request.config, config, profile_name)
+        
+        standby = None
+        
+        if standby_depth:
+            logger.info(f"Standby browsers enabled "
+                        f"(depth: {standby_depth}, profile: {profile_name})")
+            standby = StandbyDriverPool(launcher, depth=standby_depth)
+            launcher = standby.acquire
+            owned.append(standby)
+        
+        if reuse_browser:
+            pool_size = request.config.getoption("--pool-size")
+            logger.info(f"Browser pooling enabled "
+                        f"(pool size: {pool_size}, profile: {profile_name})")
+            pool = DriverPool(launcher, size=pool_size)
+            owned.insert(0, pool)
         else:
-            raise ValueError(f"Unsupported browser: {browser}")
+            pool = standby
         
-        # Configure timeouts
-        driver_instance.implicitly_wait(config.get("implicit_wait", 10))
-        driver_instance.maximize_window()
+        pools[profile_name] = pool
+        return pool
+    
+    yield get_pool
+    
+    # Pools are closed before the standby pools that back them
+    for pool in owned:
+        pool.close_all()
+
+
+@pytest.fixture(scope="function")
+def driver(request, config, driver_pools, latency_store):
+    profile_name = _get_profile_name(request, config)
+    driver_pool = driver_pools(profile_name)
+    default_blocked_urls = config.get("blocked_urls", [])
+    blocked_urls = _get_blocked_urls(request, config)
+    driver_instance = None
+    
+    try:
+        if driver_pool is not None:
+            driver_instance = driver_pool.acquire()
+        else:
+            driver_instance = _launch_driver(request.config, config, profile_name)
         
-        # Store base URL for easy access
-        driver_instance.base_url = base_url
+        if blocked_urls != default_blocked_urls:
+            NetworkBlocker.apply(driver_instance, blocked_urls)
+        driver_instance.latency_store = latency_store
         
         yield driver_instance
         
@@ -125,8 +318,59 @@ def driver(request, config):
         raise
     finally:
         if driver_instance:
-            logger.info("Closing browser")
-            driver_instance.quit()
+            discard = False
+            try:
+                if blocked_urls:
+                    NetworkBlocker.collect_stats(driver_instance)
+                if blocked_urls != default_blocked_urls and driver_pool is not None:
+                    # Pooled browsers go back with the run-wide block list
+                    NetworkBlocker.apply(driver_instance, default_blocked_urls)
+            except WebDriverException as e:
+                # A dead session must not hide the test's own failure or leak the browser
+                logger.warning(f"Request blocking teardown failed, discarding browser: {e}")
+                discard = True
+            if driver_pool is not None:
+                driver_pool.release(driver_instance, discard=discard)
+            else:
+                logger.info("Closing browser")
+                driver_instance.quit()
+
+
+@pytest.fixture(scope="session")
+def storage_states(request):
+    # One cache per xdist worker, so each worker logs in each user once
+    return StorageStateCache(request.config.getoption("--base-url"))
+
+
+@pytest.fixture(scope="function")
+def login_as(driver, storage_states, test_data):
+    def login(user_key="valid_user"):
+        user = test_data['users'][user_key]
+        
+        def ui_login(browser):
+            account_page = LoginPage.open(browser).login(user['email'], user['password'])
+            if not account_page.is_logged_in():
+                pytest.fail(f"Could not log in as {user_key}")
+        
+        storage_states.login(driver, user_key, ui_login)
+        return user
+    
+    return login
+
+
+@pytest.fixture(scope="session")
+def http_pool():
+    pool = create_http_pool()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="function")
+def seed(request, http_pool):
+    # Builds cart and login state over HTTP; call seed.apply(driver) before opening a page
+    seeder = ShopSeeder(request.config.getoption("--base-url"), pool=http_pool)
+    yield seeder
+    seeder.close()
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -154,6 +398,10 @@ def pytest_runtest_makereport(item, call):
 
 
 def pytest_configure(config):
+    # Workers get the controller's run id so their latency samples count as one run
+    if not hasattr(config, "workerinput"):
+        config.wait_latency_run_id = uuid.uuid4().hex
+    
     config.addinivalue_line(
         "markers", "smoke: mark test as smoke test"
     )
@@ -166,6 +414,9 @@ def pytest_configure(config):
 
 
 def pytest_collection_modifyitems(config, items):
+    # Browsers launched by this process need the performance log for marker-only blocking
+    config.blocked_urls_marked = any(item.get_closest_marker("blocked_urls") for item in items)
+    
     for item in items:
         # Add smoke marker to tests with 'smoke' in name
         if "smoke" in item.name.lower():
@@ -173,4 +424,46 @@ def pytest_collection_modifyitems(config, items):
         
         # Add critical marker to login/checkout tests
         if any(keyword in item.name.lower() for keyword in ["login", "checkout", "purchase"]):
-            item.add_marker(pytest.mark.critical)
\ No newline at end of file
+            item.add_marker(pytest.mark.critical)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # xdist workers hand their metrics to the controller via workeroutput
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["run_metrics"] = metrics.snapshot()
+        return
+    
+    # Runs after every worker has finished, so the whole run's samples are in
+    config = _load_config() or {}
+    if _records_latency(session.config, config):
+        store = LatencyStore.from_config(config, run_id=session.config.wait_latency_run_id)
+        session.config.wait_latency_regressions = store.regressions()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["wait_latency_run_id"] = node.config.wait_latency_run_id
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    worker_metrics = getattr(node, "workeroutput", {}).get("run_metrics")
+    if worker_metrics:
+        metrics.merge(worker_metrics)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    regressions = getattr(config, "wait_latency_regressions", [])
+    if regressions:
+        terminalreporter.write_sep("=", "wait latency regressions")
+        for key, baseline, median in regressions:
+            terminalreporter.write_line(f"{key}: median {baseline:.2f}s -> {median:.2f}s")
+    
+    lines = metrics.format_lines()
+    if not lines:
+        return
+    
+    terminalreporter.write_sep("=", "performance metrics")
+    for line in lines:
+        terminalreporter.write_line(line)
\ No newline at end of file
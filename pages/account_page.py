@@ -2,6 +2,8 @@
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
 from utils.logger import get_logger
+from utils.session_probe import SessionProbe
+from utils.wait_helpers import Condition
 
 logger = get_logger(__name__)
 
@@ -23,12 +25,26 @@ class AccountPage(BasePage):
     NEWSLETTER_LINK = (By.LINK_TEXT, "Newsletter")
     LOGOUT_LINK = (By.LINK_TEXT, "Logout")
     SUCCESS_MESSAGE = (By.CSS_SELECTOR, ".alert-success")
+    # Shown on the login page when credentials are rejected
+    LOGIN_WARNING = (By.CSS_SELECTOR, ".alert-danger")
+    
+    READY_LOCATORS = (EDIT_ACCOUNT_LINK,)
     
     def __init__(self, driver):
         super().__init__(driver)
     
     def is_logged_in(self):
-        return self.is_element_visible(self.EDIT_ACCOUNT_LINK, timeout=10)
+        # A rejected login shows a warning straight away; no need to wait out the timeout
+        match = self.find_first_of(
+            [
+                Condition(self.EDIT_ACCOUNT_LINK, "visible"),
+                Condition(self.LOGIN_WARNING, "visible")
+            ],
+            timeout=10
+        )
+        if match is None:
+            return bool(SessionProbe(self.driver, self.base_url).is_logged_in())
+        return match == 0
     
     def go_to_edit_account(self):
         logger.info("Navigating to edit account page")
@@ -59,6 +75,7 @@ class AccountPage(BasePage):
     def logout(self):
         logger.info("Logging out from account page")
         self.click_element(self.LOGOUT_LINK)
+        self.wait_helper.wait_for_url_contains("account/logout")
         
         from .home_page import HomePage
         return HomePage(self.driver)
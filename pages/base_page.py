@@ -1,25 +1,234 @@
 
+import difflib
+import time
+from urllib.parse import parse_qs, urlsplit
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
-from utils.wait_helpers import WaitHelpers
+from utils.element_cache import ElementCache
+from utils.js_locators import build_script
+from utils.wait_helpers import Condition, WaitHelpers
 from utils.logger import get_logger
+from utils.run_metrics import metrics
 
 logger = get_logger(__name__)
 
 
+# Reads every match of a locator in one call. Returns null while none of the page's
+# ready locators is visible, so callers only pay for a wait when the page is not rendered.
+EXTRACT_SCRIPT = build_script("""
+const [by, value, ready, mode, name] = arguments;
+if (ready.length && !ready.some(r => findAll(r[0], r[1]).some(isVisible))) {
+    return null;
+}
+
+function readAttribute(e, attribute) {
+    const property = e[attribute];
+    if (typeof property === 'boolean') {
+        return property ? 'true' : null;
+    }
+    if (typeof property === 'string' || typeof property === 'number') {
+        return String(property);
+    }
+    return e.getAttribute(attribute);
+}
+
+// A field is [css selector within the row, "text" | "element" | attribute name]
+function readField(row, field) {
+    const [selector, kind] = field;
+    const e = row.querySelector(selector);
+    if (!e) {
+        return null;
+    }
+    if (kind === 'text') {
+        return e.innerText.trim();
+    }
+    return kind === 'element' ? e : readAttribute(e, kind);
+}
+
+const elements = findAll(by, value);
+if (mode === 'count') {
+    return elements.length;
+}
+if (mode === 'text') {
+    return elements.map(e => e.innerText.trim());
+}
+if (mode === 'rows') {
+    return elements.map(row => Object.fromEntries(
+        Object.entries(name).map(([key, field]) => [key, readField(row, field)])));
+}
+return elements.map(e => readAttribute(e, name));
+""")
+
+# Sets form fields in order, starting at arguments[1], and fires the events a user's
+# input would. Stops at the first field that needs real keystrokes, is not visible yet
+# or whose option has not loaded, so the caller can handle it and continue from there.
+FILL_FORM_SCRIPT = build_script("""
+const [fields, start] = arguments;
+const setters = {
+    INPUT: Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set,
+    TEXTAREA: Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, 'value').set
+};
+
+function fire(e, type) {
+    e.dispatchEvent(new Event(type, {bubbles: true}));
+}
+
+for (let i = start; i < fields.length; i++) {
+    const f = fields[i];
+    if (f.typed) {
+        return {index: i, reason: 'typed'};
+    }
+    const e = findAll(f.by, f.value).find(isVisible);
+    if (!e) {
+        return {index: i, reason: 'missing'};
+    }
+    
+    if (e.tagName === 'SELECT') {
+        const options = Array.from(e.options);
+        const option = options.find(o => o.text.trim() === f.input) ||
+            options.find(o => o.value === f.input);
+        if (!option) {
+            return {index: i, reason: 'option', options: options.map(o => o.text.trim())};
+        }
+        // Re-selecting would repeat any AJAX the change handler triggers
+        if (e.value === option.value) {
+            continue;
+        }
+        e.value = option.value;
+    } else if (typeof f.input === 'boolean') {
+        if (e.checked === f.input) {
+            continue;
+        }
+        e.checked = f.input;
+    } else {
+        e.focus();
+        // The prototype setter keeps framework-tracked inputs in sync
+        const setter = setters[e.tagName];
+        setter ? setter.call(e, f.input) : e.value = f.input;
+    }
+    
+    fire(e, 'input');
+    fire(e, 'change');
+    if (document.activeElement === e) {
+        e.blur();
+    }
+}
+return {index: fields.length, reason: null};
+""")
+
+# Picks an option by its (whitespace-normalised) text or by value and fires the events a
+# user's choice would. Returns null when selected, otherwise the option texts (or values).
+SELECT_OPTION_SCRIPT = """
+const [select, mode, wanted] = arguments;
+const normalise = text => text.replace(/\\s+/g, ' ').trim();
+const options = Array.from(select.options);
+const option = options.find(
+    o => mode === 'value' ? o.value === wanted : normalise(o.text) === wanted
+);
+if (!option) {
+    return options.map(o => mode === 'value' ? o.value : normalise(o.text));
+}
+// Re-selecting would repeat any AJAX the change handler triggers
+if (select.value !== option.value || !option.selected) {
+    option.selected = true;
+    select.dispatchEvent(new Event('input', {bubbles: true}));
+    select.dispatchEvent(new Event('change', {bubbles: true}));
+}
+return null;
+"""
+
+
+def _option_error(locator, wanted, options):
+    closest = difflib.get_close_matches(wanted, options, n=5, cutoff=0.4) or options[:5]
+    return NoSuchElementException(
+        f"Option '{wanted}' not found in {locator} ({len(options)} options); closest: {closest}"
+    )
+
+
 class BasePage:
     
+    # Locators whose visibility means the page is usable; any one of them is enough
+    READY_LOCATORS = ()
+    
     def __init__(self, driver):
         self.driver = driver
-        self.wait_helper = WaitHelpers(driver)
+        self.wait_helper = WaitHelpers(driver, owner=type(self))
         self.base_url = getattr(driver, 'base_url', 'https://demo.opencart.com')
+        self.element_cache = None
+        self._header = None
+        if getattr(driver, 'cache_elements', False):
+            self.enable_element_cache()
+    
+    @classmethod
+    def attach(cls, driver):
+        # Page object for whatever the browser shows now, without navigating
+        return cls(driver)
+    
+    @classmethod
+    def open(cls, driver, **params):
+        # Loads the page straight from its route instead of clicking through menus
+        from .routes import route_path
+        page = cls.attach(driver)
+        page.navigate_to(route_path(cls, **params))
+        return page
+    
+    @property
+    def header(self):
+        # Search, account menu and cart link shared by every store page
+        from .header import Header
+        if isinstance(self, Header):
+            return self
+        if self._header is None:
+            self._header = Header(self.driver)
+        return self._header
+    
+    def enable_element_cache(self):
+        # Reuses elements this page already located until a navigation or stale element
+        self.element_cache = ElementCache(self.driver)
+        self.wait_helper.element_cache = self.element_cache
+        return self.element_cache
     
     def navigate_to(self, url):
         full_url = url if url.startswith('http') else f"{self.base_url}{url}"
         logger.info(f"Navigating to: {full_url}")
         self.driver.get(full_url)
+        if self.element_cache is not None:
+            self.element_cache.clear()
+        
+        # With eager/none strategies driver.get returns before the page is usable
+        if self.get_page_load_strategy() == "normal":
+            return
+        if self._redirected_from(full_url):
+            # e.g. checkout with an empty cart lands on the cart; this page never renders
+            logger.info(f"Redirected to {self.driver.current_url}, not waiting for "
+                        f"{type(self).__name__}")
+            self.wait_helper.wait_for_document_ready()
+            return
+        try:
+            self.wait_until_ready()
+        except TimeoutException:
+            # Same outcome as a normal page load: callers check the page themselves
+            logger.warning(f"{type(self).__name__} not ready after navigating to {full_url}")
+    
+    def _redirected_from(self, url):
+        requested = parse_qs(urlsplit(url).query).get("route")
+        if not requested:
+            return False
+        return parse_qs(urlsplit(self.driver.current_url).query).get("route") != requested
+    
+    def get_page_load_strategy(self):
+        return self.driver.capabilities.get("pageLoadStrategy", "normal")
+    
+    def wait_until_ready(self, timeout=None):
+        if not self.READY_LOCATORS:
+            self.wait_helper.wait_for_document_ready(timeout)
+            return
+        self.wait_helper.wait_for_any(
+            [Condition(locator, "visible") for locator in self.READY_LOCATORS], timeout
+        )
+        logger.debug(f"{type(self).__name__} is ready")
     
     def get_current_url(self):
         return self.driver.current_url
@@ -27,26 +236,141 @@ class BasePage:
     def get_page_title(self):
         return self.driver.title
     
+    def get_implicit_wait(self):
+        return getattr(self.driver, 'implicit_wait', 10)
+    
     def is_element_present(self, locator, timeout=5):
+        if timeout == 0:
+            return not self.is_element_absent_now(locator)
+        
+        start = time.monotonic()
         try:
             self.wait_helper.wait_for_element_present(locator, timeout)
             return True
         except TimeoutException:
+            self._record_negative_check(start, timeout)
             return False
     
     def is_element_visible(self, locator, timeout=5):
+        start = time.monotonic()
         try:
             self.wait_helper.wait_for_element_visible(locator, timeout)
             return True
         except TimeoutException:
+            self._record_negative_check(start, timeout)
             return False
     
+    def find_first_of(self, alternatives, timeout=5):
+        start = time.monotonic()
+        try:
+            return self.wait_helper.wait_for_any(alternatives, timeout)
+        except TimeoutException:
+            self._record_negative_check(start, timeout)
+            return None
+    
+    def is_element_absent_now(self, locator):
+        return self.wait_helper.is_absent_now(locator)
+    
+    def find_elements(self, locator):
+        # Without an implicit wait nothing else holds list lookups back until the page renders
+        if self.get_implicit_wait() == 0 and self.READY_LOCATORS:
+            try:
+                self.wait_until_ready()
+            except TimeoutException:
+                logger.warning(f"{type(self).__name__} not ready, looking up {locator} anyway")
+        return self.driver.find_elements(*locator)
+    
+    def get_texts(self, locator):
+        return self._extract(locator, "text")
+    
+    def get_attributes(self, locator, attribute):
+        return self._extract(locator, "attribute", attribute)
+    
+    def count_elements(self, locator):
+        return self._extract(locator, "count")
+    
+    def get_rows(self, row_locator, fields):
+        # fields maps a key to (css selector within the row, "text", "element" or an attribute)
+        fields = {key: list(field) for key, field in fields.items()}
+        return self._extract(row_locator, "rows", fields)
+    
+    def _extract(self, locator, mode, attribute=None):
+        by, value = locator
+        ready = [list(ready_locator) for ready_locator in self.READY_LOCATORS]
+        result = self.driver.execute_script(EXTRACT_SCRIPT, by, value, ready, mode, attribute)
+        metrics.increment("bulk_extraction.calls")
+        
+        if result is None:
+            try:
+                self.wait_until_ready()
+            except TimeoutException:
+                logger.warning(f"{type(self).__name__} not ready, reading {locator} anyway")
+            result = self.driver.execute_script(EXTRACT_SCRIPT, by, value, [], mode, attribute)
+            metrics.increment("bulk_extraction.calls")
+        return result
+    
+    def _record_negative_check(self, start, timeout):
+        elapsed = time.monotonic() - start
+        metrics.observe("negative_checks", elapsed)
+        # Time beyond the requested timeout comes from implicit waits inside each poll
+        metrics.increment("negative_checks.overshoot_s", max(elapsed - (timeout or 0), 0.0))
+    
     def click_element(self, locator, timeout=None):
         self.wait_helper.safe_click(locator, timeout)
     
+    def click_and_wait_for_network(self, locator, quiet_ms=None, timeout=None):
+        # For AJAX actions: returns once the requests the click started have been answered
+        self.wait_helper.track_network()
+        self.click_element(locator, timeout)
+        self.wait_helper.wait_for_network_idle(quiet_ms, timeout)
+    
     def send_keys_to_element(self, locator, text, clear_first=True, timeout=None):
         self.wait_helper.safe_send_keys(locator, text, clear_first, timeout)
     
+    def fill_form(self, fields, typed=(), timeout=None):
+        # fields maps locators to text, option text (or value) for selects, or a bool for
+        # checkboxes and radios; locators in typed get real keystrokes instead
+        items = list(fields.items())
+        if not items:
+            return
+        typed = {tuple(locator) for locator in typed}
+        payload = [
+            {
+                "by": locator[0],
+                "value": locator[1],
+                "input": value if isinstance(value, bool) else str(value),
+                "typed": tuple(locator) in typed
+            }
+            for locator, value in items
+        ]
+        
+        start_time = time.monotonic()
+        deadline = start_time + (timeout or self.wait_helper.timeout)
+        index = 0
+        
+        while True:
+            result = self.driver.execute_script(FILL_FORM_SCRIPT, payload, index)
+            metrics.increment("fill_form.calls")
+            index = result["index"]
+            
+            if result["reason"] == "typed":
+                locator, value = items[index]
+                self.send_keys_to_element(locator, value)
+                index += 1
+                continue
+            if result["reason"] is None:
+                break
+            
+            if time.monotonic() >= deadline:
+                locator, value = items[index]
+                if result["reason"] == "option":
+                    raise _option_error(locator, str(value), result["options"])
+                raise TimeoutException(f"Form field not visible: {locator}")
+            time.sleep(self.wait_helper.ANY_POLL_INTERVAL)
+        
+        metrics.observe("fill_form", time.monotonic() - start_time)
+        logger.debug(f"Filled {len(items)} form fields")
+    
     def get_element_text(self, locator, timeout=None):
         return self.wait_helper.wait_and_get_text(locator, timeout)
     
@@ -54,20 +378,37 @@ class BasePage:
         element = self.wait_helper.wait_for_element_present(locator, timeout)
         return element.get_attribute(attribute)
     
-    def select_dropdown_by_text(self, locator, text, timeout=None):
+    def select_dropdown_by_text(self, locator, text, timeout=None, native=False):
         element = self.wait_helper.wait_for_element_visible(locator, timeout)
-        select = Select(element)
-        select.select_by_visible_text(text)
+        if native:
+            Select(element).select_by_visible_text(text)
+        else:
+            self._select_option(locator, element, "text", text)
         logger.debug(f"Selected dropdown option: {text}")
     
-    def select_dropdown_by_value(self, locator, value, timeout=None):
+    def select_dropdown_by_value(self, locator, value, timeout=None, native=False):
         element = self.wait_helper.wait_for_element_visible(locator, timeout)
-        select = Select(element)
-        select.select_by_value(value)
+        if native:
+            Select(element).select_by_value(value)
+        else:
+            self._select_option(locator, element, "value", value)
         logger.debug(f"Selected dropdown value: {value}")
     
+    def _select_option(self, locator, element, mode, wanted):
+        # One script call however long the list is; Select inspects options one at a time
+        options = self.driver.execute_script(SELECT_OPTION_SCRIPT, element, mode, wanted)
+        metrics.increment("select_option.calls")
+        if options is not None:
+            raise _option_error(locator, wanted, options)
+    
     def wait_for_page_load(self, timeout=30):
-        self.driver.implicitly_wait(0)  # Temporarily disable implicit wait
+        if self.READY_LOCATORS and self.get_page_load_strategy() != "normal":
+            self.wait_until_ready(timeout)
+            return
+        
+        implicit_wait = self.get_implicit_wait()
+        if implicit_wait:
+            self.driver.implicitly_wait(0)  # Temporarily disable implicit wait
         try:
             self.wait_helper.wait.until(
                 lambda driver: driver.execute_script("return document.readyState") == "complete"
@@ -76,7 +417,8 @@ class BasePage:
         except TimeoutException:
             logger.warning(f"Page did not load completely within {timeout}s")
         finally:
-            self.driver.implicitly_wait(10)  # Restore implicit wait
+            if implicit_wait:
+                self.driver.implicitly_wait(implicit_wait)  # Restore implicit wait
     
     def scroll_to_element(self, locator, timeout=None):
         element = self.wait_helper.wait_for_element_present(locator, timeout)
@@ -94,6 +436,8 @@ class BasePage:
     def refresh_page(self):
         logger.info("Refreshing page")
         self.driver.refresh()
+        if self.element_cache is not None:
+            self.element_cache.clear()
         self.wait_for_page_load()
     
     def switch_to_window(self, window_handle):
@@ -1,11 +1,50 @@
 
+import re
+import time
+
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 from .base_page import BasePage
+from .records import PRODUCT_ID_PATTERN, CartRecord, parse_id, parse_int
+from .routes import route_path
+from utils.js_locators import build_script
+from utils.wait_helpers import Condition
 from utils.logger import get_logger
+from utils.run_metrics import metrics
 
 logger = get_logger(__name__)
 
 
+CART_KEY_PATTERN = re.compile(r"quantity\[(.+)\]")
+
+# Posts every removal in parallel from the browser so the session cookie applies;
+# calls back with true only if all of them succeeded
+REMOVE_CART_KEYS_SCRIPT = """
+const [url, keys] = arguments;
+const done = arguments[arguments.length - 1];
+const requests = keys.map(key => fetch(url, {
+    method: 'POST',
+    credentials: 'same-origin',
+    headers: {
+        'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
+        'X-Requested-With': 'XMLHttpRequest'
+    },
+    body: 'key=' + encodeURIComponent(key)
+}).then(response => response.ok));
+Promise.all(requests).then(results => done(results.every(Boolean)), () => done(false));
+"""
+
+# Clicks every remove button at once; returns a row so the caller can wait for the reload
+CLICK_ALL_SCRIPT = build_script("""
+const rows = findAll(arguments[0], arguments[1]);
+const buttons = findAll(arguments[2], arguments[3]);
+buttons.forEach(button => button.click());
+return buttons.length ? rows[0] : null;
+""")
+
+
 class CartPage(BasePage):
     
     # Locators
@@ -22,49 +61,145 @@ class CartPage(BasePage):
     COUPON_INPUT = (By.ID, "input-coupon")
     APPLY_COUPON_BUTTON = (By.ID, "button-coupon")
     
+    READY_LOCATORS = (CART_ITEMS, EMPTY_CART_MESSAGE)
+    
+    CART_URL = route_path("CartPage")
+    CART_REMOVE_URL = "/index.php?route=checkout/cart/remove"
+    # Removals racing the page reload can be lost; clicking is retried this many times
+    CLICK_REMOVE_PASSES = 3
+    
+    # Fields read from each CART_ITEMS row by rows()
+    ROW_FIELDS = {
+        "name": ("td:nth-child(2) a", "text"),
+        "link": ("td:nth-child(2) a", "href"),
+        "model": ("td:nth-child(3)", "text"),
+        "quantity": ("input[name^='quantity']", "value"),
+        "unit_price": ("td:nth-child(5)", "text"),
+        "total": ("td:nth-child(6)", "text"),
+        "quantity_input": ("input[name^='quantity']", "element"),
+        "update_button": ("button[data-original-title='Update']", "element"),
+        "remove_button": ("button[data-original-title='Remove']", "element")
+    }
+    
     def __init__(self, driver):
         super().__init__(driver)
     
     def get_cart_items_count(self):
         try:
-            elements = self.driver.find_elements(*self.CART_ITEMS)
-            count = len(elements)
+            count = self.count_elements(self.CART_ITEMS)
             logger.info(f"Cart contains {count} items")
             return count
         except:
             return 0
     
     def get_product_names(self):
-        elements = self.driver.find_elements(*self.PRODUCT_NAMES)
-        names = [elem.text for elem in elements]
+        names = self.get_texts(self.PRODUCT_NAMES)
         logger.info(f"Products in cart: {names}")
         return names
     
+    def rows(self):
+        records = [
+            CartRecord(
+                name=row["name"],
+                model=row["model"],
+                quantity=parse_int(row["quantity"]),
+                unit_price=row["unit_price"],
+                total=row["total"],
+                product_id=parse_id(PRODUCT_ID_PATTERN, row["link"]),
+                quantity_input=row["quantity_input"],
+                update_button=row["update_button"],
+                remove_button=row["remove_button"]
+            )
+            for row in self.get_rows(self.CART_ITEMS, self.ROW_FIELDS)
+        ]
+        logger.info(f"Read {len(records)} cart rows")
+        return records
+    
     def is_product_in_cart(self, product_name):
         product_names = self.get_product_names()
         return product_name in product_names
     
     def update_quantity(self, product_index, quantity):
         logger.info(f"Updating quantity for product {product_index} to {quantity}")
-        quantity_inputs = self.driver.find_elements(*self.QUANTITY_INPUTS)
-        update_buttons = self.driver.find_elements(*self.UPDATE_BUTTONS)
+        quantity_inputs = self.find_elements(self.QUANTITY_INPUTS)
+        update_buttons = self.find_elements(self.UPDATE_BUTTONS)
         
         if product_index < len(quantity_inputs):
+            row = self.find_elements(self.CART_ITEMS)[product_index]
             quantity_inputs[product_index].clear()
             quantity_inputs[product_index].send_keys(str(quantity))
             update_buttons[product_index].click()
+            # Update submits the cart form, so the whole page reloads rather than an XHR
+            try:
+                WebDriverWait(self.driver, self.wait_helper.timeout).until(
+                    EC.staleness_of(row)
+                )
+            except TimeoutException:
+                logger.warning("Cart did not reload after updating the quantity")
+                return
+            if self.element_cache is not None:
+                self.element_cache.clear("cart updated")
+            self.wait_until_ready()
     
     def remove_product(self, product_index):
         logger.info(f"Removing product at index {product_index}")
-        remove_buttons = self.driver.find_elements(*self.REMOVE_BUTTONS)
+        remove_buttons = self.find_elements(self.REMOVE_BUTTONS)
         
         if product_index < len(remove_buttons):
             remove_buttons[product_index].click()
     
+    def get_cart_keys(self):
+        names = self.get_attributes(self.QUANTITY_INPUTS, "name")
+        return [match.group(1) for match in map(CART_KEY_PATTERN.match, names) if match]
+    
     def remove_all_products(self):
         logger.info("Removing all products from cart")
-        while self.get_cart_items_count() > 0:
-            self.remove_product(0)
+        start = time.monotonic()
+        keys = self.get_cart_keys()
+        
+        removed = 0
+        if keys:
+            if self._remove_via_endpoint(keys):
+                self.navigate_to(self.CART_URL)
+            else:
+                logger.warning("Cart remove endpoint failed, clicking remove buttons instead")
+                self._remove_by_clicking()
+            # Both paths can give up with rows left, so count what actually went
+            removed = len(keys) - len(self.get_cart_keys())
+        
+        metrics.observe("cart_reset", time.monotonic() - start)
+        metrics.increment("cart_reset.items", removed)
+        logger.info(
+            f"Removed {removed} of {len(keys)} cart items in {time.monotonic() - start:.2f}s"
+        )
+        return self.is_cart_empty()
+    
+    def _remove_via_endpoint(self, keys):
+        try:
+            return self.driver.execute_async_script(
+                REMOVE_CART_KEYS_SCRIPT, f"{self.base_url}{self.CART_REMOVE_URL}", keys
+            )
+        except Exception as e:
+            logger.debug(f"Removing cart items via endpoint failed: {e}")
+            return False
+    
+    def _remove_by_clicking(self):
+        for _ in range(self.CLICK_REMOVE_PASSES):
+            first_row = self.driver.execute_script(
+                CLICK_ALL_SCRIPT, *self.CART_ITEMS, *self.REMOVE_BUTTONS
+            )
+            if first_row is None:
+                return
+            
+            # Each removal reloads the cart when it finishes; wait once for the table to go
+            try:
+                WebDriverWait(self.driver, self.wait_helper.timeout).until(
+                    EC.staleness_of(first_row)
+                )
+            except TimeoutException:
+                logger.warning("Cart did not reload after removing products")
+                return
+            self.wait_until_ready()
     
     def get_total_price(self):
         price = self.get_element_text(self.TOTAL_PRICE)
@@ -86,11 +221,13 @@ class CartPage(BasePage):
         return HomePage(self.driver)
     
     def is_cart_empty(self):
-        try:
-            message = self.get_element_text(self.EMPTY_CART_MESSAGE)
-            return "empty" in message.lower()
-        except:
+        match = self.find_first_of(
+            [Condition(self.EMPTY_CART_MESSAGE, "text", "empty"), self.CART_ITEMS],
+            timeout=self.wait_helper.timeout
+        )
+        if match is None:
             return self.get_cart_items_count() == 0
+        return match == 0
     
     def apply_coupon(self, coupon_code):
         logger.info(f"Applying coupon: {coupon_code}")
@@ -98,5 +235,4 @@ class CartPage(BasePage):
         self.click_element(self.APPLY_COUPON_BUTTON)
     
     def is_page_loaded(self):
-        return self.is_element_present(self.CART_ITEMS, timeout=10) or \
-               self.is_element_present(self.EMPTY_CART_MESSAGE, timeout=10)
\ No newline at end of file
+        return self.find_first_of(self.READY_LOCATORS, timeout=10) is not None
\ No newline at end of file
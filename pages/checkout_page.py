@@ -1,11 +1,42 @@
 
+import time
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
+from utils.js_locators import build_script
 from utils.logger import get_logger
+from utils.run_metrics import metrics
+from utils.wait_helpers import is_document_replaced
 
 logger = get_logger(__name__)
 
 
+# Reports the open accordion step (the panel AJAX has filled and expanded), any visible
+# validation errors, and whether the order went through, in one call
+STEP_PROBE_SCRIPT = build_script("""
+if (location.href.indexOf('checkout/success') !== -1) {
+    return {step: 'success', errors: []};
+}
+let step = null;
+for (const panel of document.querySelectorAll('#accordion .panel-collapse, #accordion .collapse')) {
+    const open = panel.classList.contains('in') || panel.classList.contains('show');
+    const settled = !panel.classList.contains('collapsing');
+    if (open && settled && panel.querySelector('input, button, select')) {
+        step = panel.id.replace('collapse-', '');
+        break;
+    }
+}
+const errors = Array.from(
+    document.querySelectorAll('#accordion .alert-danger, #accordion .text-danger')
+)
+    .filter(isVisible)
+    .map(element => element.textContent.trim())
+    .filter(text => text);
+return {step: step, errors: errors};
+""")
+
+
 class CheckoutPage(BasePage):
     
     # Locators - Step 1: Checkout Options
@@ -25,6 +56,8 @@ class CheckoutPage(BasePage):
     COUNTRY_DROPDOWN = (By.ID, "input-payment-country")
     REGION_DROPDOWN = (By.ID, "input-payment-zone")
     BILLING_CONTINUE = (By.ID, "button-guest")
+    # Shown instead of the billing fields to a logged-in customer with a saved address
+    PAYMENT_ADDRESS_CONTINUE = (By.ID, "button-payment-address")
     
     # Locators - Step 3: Delivery Details
     DELIVERY_CONTINUE = (By.ID, "button-shipping-address")
@@ -41,8 +74,23 @@ class CheckoutPage(BasePage):
     SUCCESS_MESSAGE = (By.CSS_SELECTOR, "#content h1")
     ORDER_NUMBER = (By.CSS_SELECTOR, "#content p:nth-child(2)")
     
+    # A logged-in customer with a saved address sees only the address step's continue button
+    READY_LOCATORS = (GUEST_CHECKOUT_RADIO, FIRST_NAME_INPUT, PAYMENT_ADDRESS_CONTINUE)
+    
+    # Steps each step can open next; delivery steps are skipped when the billing address
+    # is reused or the cart needs no shipping
+    TRANSITIONS = {
+        "checkout-option": ("payment-address",),
+        "payment-address": ("shipping-address", "shipping-method", "payment-method"),
+        "shipping-address": ("shipping-method", "payment-method"),
+        "shipping-method": ("payment-method",),
+        "payment-method": ("checkout-confirm",),
+        "checkout-confirm": ("success",)
+    }
+    
     def __init__(self, driver):
         super().__init__(driver)
+        self.step_timings = []
     
     def select_guest_checkout(self):
         logger.info("Selecting guest checkout")
@@ -55,17 +103,18 @@ class CheckoutPage(BasePage):
                             region="California"):
         logger.info(f"Filling billing details for: {email}")
         
-        self.send_keys_to_element(self.FIRST_NAME_INPUT, first_name)
-        self.send_keys_to_element(self.LAST_NAME_INPUT, last_name)
-        self.send_keys_to_element(self.EMAIL_INPUT, email)
-        self.send_keys_to_element(self.TELEPHONE_INPUT, telephone)
-        self.send_keys_to_element(self.ADDRESS_INPUT, address)
-        self.send_keys_to_element(self.CITY_INPUT, city)
-        self.send_keys_to_element(self.POSTCODE_INPUT, postcode)
-        
-        self.select_dropdown_by_text(self.COUNTRY_DROPDOWN, country)
-        self.wait_helper.wait_for_element_visible(self.REGION_DROPDOWN, timeout=5)
-        self.select_dropdown_by_text(self.REGION_DROPDOWN, region)
+        # Regions load over AJAX after the country changes; fill_form waits for the option
+        self.fill_form({
+            self.FIRST_NAME_INPUT: first_name,
+            self.LAST_NAME_INPUT: last_name,
+            self.EMAIL_INPUT: email,
+            self.TELEPHONE_INPUT: telephone,
+            self.ADDRESS_INPUT: address,
+            self.CITY_INPUT: city,
+            self.POSTCODE_INPUT: postcode,
+            self.COUNTRY_DROPDOWN: country,
+            self.REGION_DROPDOWN: region
+        })
         
         self.click_element(self.BILLING_CONTINUE)
     
@@ -104,13 +153,70 @@ class CheckoutPage(BasePage):
             return text
         return ""
     
-    def complete_guest_checkout(self, billing_details):
+    def get_checkout_state(self):
+        return self.driver.execute_script(STEP_PROBE_SCRIPT)
+    
+    def get_current_step(self):
+        return self.get_checkout_state()["step"]
+    
+    def wait_for_step(self, steps, timeout=None):
+        # Polls the step probe until one of steps is open; the panels only open once the
+        # previous step's AJAX response has arrived, so nothing waits on a fixed timeout
+        deadline = time.monotonic() + (timeout or self.wait_helper.timeout)
+        while True:
+            try:
+                state = self.get_checkout_state()
+            except JavascriptException as e:
+                if not is_document_replaced(e):
+                    raise
+                # Confirming navigates to checkout/success; probe the new document next
+                state = {"step": None, "errors": []}
+            if state["step"] in steps or state["errors"]:
+                return state
+            if time.monotonic() >= deadline:
+                raise TimeoutException(
+                    f"Checkout did not reach {', '.join(steps)} (open step: {state['step']})"
+                )
+            time.sleep(self.wait_helper.ANY_POLL_INTERVAL)
+    
+    def complete_guest_checkout(self, billing_details, timeout=None):
         logger.info("Starting guest checkout process")
+        actions = {
+            "checkout-option": self.select_guest_checkout,
+            "payment-address": lambda: self._submit_payment_address(billing_details),
+            "shipping-address": lambda: self.click_element(self.DELIVERY_CONTINUE),
+            "shipping-method": lambda: self.click_element(self.DELIVERY_METHOD_CONTINUE),
+            "payment-method": self._accept_terms_and_submit_payment,
+            "checkout-confirm": lambda: self.click_element(self.CONFIRM_ORDER_BUTTON)
+        }
+        self.step_timings = []
         
-        # Step 1: Select guest checkout
-        self.select_guest_checkout()
+        # A logged-in customer starts at the billing address, so start wherever the page is
+        state = self.wait_for_step(tuple(self.TRANSITIONS), timeout)
+        while not state["errors"] and state["step"] != "success":
+            step = state["step"]
+            start = time.monotonic()
+            actions[step]()
+            state = self.wait_for_step(self.TRANSITIONS[step], timeout)
+            
+            elapsed = time.monotonic() - start
+            self.step_timings.append((step, elapsed))
+            metrics.observe(f"checkout.{step}", elapsed)
+            logger.info(f"Checkout step {step} took {elapsed:.2f}s, next: {state['step']}")
         
-        # Step 2: Fill billing details
+        if state["errors"]:
+            logger.error(f"Checkout stopped at {state['step']}: {'; '.join(state['errors'])}")
+            return False
+        return self.is_order_success()
+    
+    def _submit_payment_address(self, billing_details):
+        # A logged-in customer's saved address is already selected, so only continue
+        if self.count_elements(self.PAYMENT_ADDRESS_CONTINUE):
+            self.click_element(self.PAYMENT_ADDRESS_CONTINUE)
+        else:
+            self._submit_billing_details(billing_details)
+    
+    def _submit_billing_details(self, billing_details):
         self.fill_billing_details(
             billing_details.get('first_name'),
             billing_details.get('last_name'),
@@ -122,19 +228,12 @@ class CheckoutPage(BasePage):
             billing_details.get('country', 'United States'),
             billing_details.get('region', 'California')
         )
-        
-        # Step 3: Continue delivery details
-        self.continue_delivery_details()
-        
-        # Step 4: Continue delivery method
-        self.continue_delivery_method()
-        
-        # Step 5: Accept terms and continue payment
-        self.accept_terms_and_continue_payment()
-        
-        # Step 6: Confirm order
-        return self.confirm_order()
+    
+    def _accept_terms_and_submit_payment(self):
+        # Stores without a terms page show no checkbox
+        if self.count_elements(self.TERMS_CHECKBOX):
+            self.fill_form({self.TERMS_CHECKBOX: True})
+        self.click_element(self.PAYMENT_METHOD_CONTINUE)
     
     def is_page_loaded(self):
-        return self.is_element_present(self.GUEST_CHECKOUT_RADIO, timeout=10) or \
-               self.is_element_present(self.FIRST_NAME_INPUT, timeout=10)
\ No newline at end of file
+        return self.find_first_of(self.READY_LOCATORS, timeout=10) is not None
\ No newline at end of file
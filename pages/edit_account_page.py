@@ -17,23 +17,21 @@ class EditAccountPage(BasePage):
     BACK_BUTTON = (By.LINK_TEXT, "Back")
     SUCCESS_MESSAGE = (By.CSS_SELECTOR, ".alert-success")
     
+    READY_LOCATORS = (FIRST_NAME_INPUT,)
+    
     def __init__(self, driver):
         super().__init__(driver)
     
     def update_account(self, first_name=None, last_name=None, email=None, telephone=None):
         logger.info("Updating account information")
         
-        if first_name:
-            self.send_keys_to_element(self.FIRST_NAME_INPUT, first_name)
-        
-        if last_name:
-            self.send_keys_to_element(self.LAST_NAME_INPUT, last_name)
-        
-        if email:
-            self.send_keys_to_element(self.EMAIL_INPUT, email)
-        
-        if telephone:
-            self.send_keys_to_element(self.TELEPHONE_INPUT, telephone)
+        fields = {
+            self.FIRST_NAME_INPUT: first_name,
+            self.LAST_NAME_INPUT: last_name,
+            self.EMAIL_INPUT: email,
+            self.TELEPHONE_INPUT: telephone
+        }
+        self.fill_form({locator: value for locator, value in fields.items() if value})
         
         self.click_element(self.CONTINUE_BUTTON)
         
@@ -1,96 +1,52 @@
-
 from selenium.webdriver.common.by import By
-from .base_page import BasePage
+from .header import Header
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-class HomePage(BasePage):
+class HomePage(Header):
     
-    # Locators
+    # Locators (header locators and actions come from Header)
     LOGO = (By.CSS_SELECTOR, "#logo a")
-    SEARCH_INPUT = (By.NAME, "search")
-    SEARCH_BUTTON = (By.CSS_SELECTOR, "button.btn-default")
-    MY_ACCOUNT_DROPDOWN = (By.CSS_SELECTOR, "a[title='My Account']")
-    LOGIN_LINK = (By.LINK_TEXT, "Login")
-    REGISTER_LINK = (By.LINK_TEXT, "Register")
-    LOGOUT_LINK = (By.LINK_TEXT, "Logout")
-    SHOPPING_CART_LINK = (By.CSS_SELECTOR, "a[title='Shopping Cart']")
-    CHECKOUT_LINK = (By.LINK_TEXT, "Checkout")
     FEATURED_PRODUCTS = (By.CSS_SELECTOR, ".product-layout")
-    CURRENCY_DROPDOWN = (By.CSS_SELECTOR, "button.dropdown-toggle")
-    ACCOUNT_LINK = (By.LINK_TEXT, "My Account")
-    
-    def __init__(self, driver):
-        super().__init__(driver)
-        self.navigate_to("/")
-    
-    def search_product(self, product_name):
-        logger.info(f"Searching for product: {product_name}")
-        self.send_keys_to_element(self.SEARCH_INPUT, product_name)
-        self.click_element(self.SEARCH_BUTTON)
-        
-        from .search_results_page import SearchResultsPage
-        return SearchResultsPage(self.driver)
-    
-    def click_my_account(self):
-        logger.info("Clicking My Account dropdown")
-        self.click_element(self.MY_ACCOUNT_DROPDOWN)
     
-    def go_to_login(self):
-        logger.info("Navigating to login page")
-        self.click_my_account()
-        self.click_element(self.LOGIN_LINK)
-        
-        from .login_page import LoginPage
-        return LoginPage(self.driver)
+    READY_LOCATORS = (LOGO,)
     
-    def go_to_register(self):
-        logger.info("Navigating to registration page")
-        self.click_my_account()
-        self.click_element(self.REGISTER_LINK)
-        
-        from .register_page import RegisterPage
-        return RegisterPage(self.driver)
+    HOME_PATH = "/"
     
-    def go_to_shopping_cart(self):
-        logger.info("Navigating to shopping cart")
-        self.click_element(self.SHOPPING_CART_LINK)
-        
-        from .cart_page import CartPage
-        return CartPage(self.driver)
-    
-    def go_to_my_account(self):
-        logger.info("Navigating to My Account page")
-        self.click_my_account()
-        self.click_element(self.ACCOUNT_LINK)
-        
-        from .account_page import AccountPage
-        return AccountPage(self.driver)
-    
-    def logout(self):
-        logger.info("Logging out")
-        self.click_my_account()
-        self.click_element(self.LOGOUT_LINK)
-        return HomePage(self.driver)
-    
-    def is_user_logged_in(self):
-        try:
-            self.click_my_account()
-            is_logged_in = self.is_element_visible(self.LOGOUT_LINK, timeout=3)
-            # Click again to close dropdown
-            self.click_my_account()
-            return is_logged_in
-        except Exception as e:
-            logger.error(f"Error checking login status: {e}")
-            return False
+    def __init__(self, driver, navigate=None):
+        super().__init__(driver)
+        # None attaches to the current page when the browser is already on the store,
+        # since the header actions work from any page; True always loads the home page
+        if navigate or (navigate is None and not self.is_on_site()):
+            self.navigate_to(self.HOME_PATH)
+    
+    @classmethod
+    def attach(cls, driver):
+        return cls(driver, navigate=False)
+    
+    def is_on_site(self):
+        # The URL alone also matches documents without the store header, such as the
+        # robots.txt page login_as and seeding leave the browser on
+        return self.get_current_url().startswith(self.base_url) and \
+            not self.is_element_absent_now(self.SEARCH_INPUT)
+    
+    def is_on_home(self):
+        url = self.get_current_url()
+        return url.rstrip("/") == self.base_url.rstrip("/") or "route=common/home" in url
+    
+    def open_home(self):
+        if not self.is_on_home():
+            self.navigate_to(self.HOME_PATH)
+        return self
     
     def get_featured_products_count(self):
-        elements = self.driver.find_elements(*self.FEATURED_PRODUCTS)
-        count = len(elements)
+        # Featured products only exist on the home page itself
+        self.open_home()
+        count = self.count_elements(self.FEATURED_PRODUCTS)
         logger.info(f"Found {count} featured products")
         return count
     
     def is_page_loaded(self):
-        return self.is_element_visible(self.LOGO, timeout=10)
\ No newline at end of file
+        return self.is_element_visible(self.LOGO, timeout=10)
@@ -16,6 +16,8 @@ class LoginPage(BasePage):
     ERROR_MESSAGE = (By.CSS_SELECTOR, ".alert-danger")
     CONTINUE_BUTTON = (By.LINK_TEXT, "Continue")
     
+    READY_LOCATORS = (EMAIL_INPUT,)
+    
     def __init__(self, driver):
         super().__init__(driver)
     
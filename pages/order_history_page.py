@@ -1,6 +1,8 @@
 
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
+from .records import OrderRecord, parse_int
+from utils.wait_helpers import Condition
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,39 +21,64 @@ class OrderHistoryPage(BasePage):
     NO_ORDERS_MESSAGE = (By.CSS_SELECTOR, "#content p")
     CONTINUE_BUTTON = (By.LINK_TEXT, "Continue")
     
+    READY_LOCATORS = (PAGE_HEADING,)
+    
+    # Fields read from each ORDER_ROWS row by rows()
+    ROW_FIELDS = {
+        "order_id": ("td:nth-child(1)", "text"),
+        "customer": ("td:nth-child(2)", "text"),
+        "quantity": ("td:nth-child(3)", "text"),
+        "status": ("td:nth-child(4)", "text"),
+        "total": ("td:nth-child(5)", "text"),
+        "date_added": ("td:nth-child(6)", "text"),
+        "view_button": ("a[data-original-title='View']", "element")
+    }
+    
     def __init__(self, driver):
         super().__init__(driver)
     
     def get_orders_count(self):
         try:
-            elements = self.driver.find_elements(*self.ORDER_ROWS)
-            count = len(elements)
+            count = self.count_elements(self.ORDER_ROWS)
             logger.info(f"Found {count} orders in history")
             return count
         except:
             return 0
     
     def get_order_ids(self):
-        elements = self.driver.find_elements(*self.ORDER_IDS)
-        order_ids = [elem.text for elem in elements]
+        order_ids = self.get_texts(self.ORDER_IDS)
         logger.info(f"Order IDs: {order_ids}")
         return order_ids
     
     def get_order_statuses(self):
-        elements = self.driver.find_elements(*self.ORDER_STATUSES)
-        statuses = [elem.text for elem in elements]
+        statuses = self.get_texts(self.ORDER_STATUSES)
         logger.info(f"Order statuses: {statuses}")
         return statuses
     
     def get_order_totals(self):
-        elements = self.driver.find_elements(*self.ORDER_TOTALS)
-        totals = [elem.text for elem in elements]
+        totals = self.get_texts(self.ORDER_TOTALS)
         logger.info(f"Order totals: {totals}")
         return totals
     
+    def rows(self):
+        records = [
+            OrderRecord(
+                order_id=row["order_id"],
+                customer=row["customer"],
+                quantity=parse_int(row["quantity"]),
+                status=row["status"],
+                total=row["total"],
+                date_added=row["date_added"],
+                view_button=row["view_button"]
+            )
+            for row in self.get_rows(self.ORDER_ROWS, self.ROW_FIELDS)
+        ]
+        logger.info(f"Read {len(records)} order history rows")
+        return records
+    
     def view_order(self, order_index=0):
         logger.info(f"Viewing order at index {order_index}")
-        view_buttons = self.driver.find_elements(*self.VIEW_BUTTONS)
+        view_buttons = self.find_elements(self.VIEW_BUTTONS)
         
         if order_index < len(view_buttons):
             view_buttons[order_index].click()
@@ -60,11 +87,15 @@ class OrderHistoryPage(BasePage):
         return self.get_orders_count() > 0
     
     def is_no_orders_message_displayed(self):
-        try:
-            message = self.get_element_text(self.NO_ORDERS_MESSAGE)
-            return "no orders" in message.lower() or "not made" in message.lower()
-        except:
-            return False
+        match = self.find_first_of(
+            [
+                Condition(self.NO_ORDERS_MESSAGE, "text", "no orders"),
+                Condition(self.NO_ORDERS_MESSAGE, "text", "not made"),
+                self.ORDER_ROWS
+            ],
+            timeout=self.wait_helper.timeout
+        )
+        return match in (0, 1)
     
     def continue_to_account(self):
         logger.info("Continuing to account page")
@@ -20,6 +20,8 @@ class ProductPage(BasePage):
     COMPARE_BUTTON = (By.CSS_SELECTOR, "button[onclick*='compare.add']")
     AVAILABILITY = (By.CSS_SELECTOR, "ul.list-unstyled li:nth-child(1)")
     
+    READY_LOCATORS = (PRODUCT_NAME,)
+    
     def __init__(self, driver):
         super().__init__(driver)
     
@@ -43,8 +45,9 @@ class ProductPage(BasePage):
         if quantity > 1:
             self.set_quantity(quantity)
         
-        self.click_element(self.ADD_TO_CART_BUTTON)
-        return self.is_success_message_displayed()
+        self.click_and_wait_for_network(self.ADD_TO_CART_BUTTON)
+        # The response has been handled, so the alert is already there or not coming
+        return self.is_element_visible(self.SUCCESS_MESSAGE, timeout=1)
     
     def is_success_message_displayed(self):
         return self.is_element_visible(self.SUCCESS_MESSAGE, timeout=5)
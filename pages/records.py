@@ -0,0 +1,61 @@
+import re
+
+
+PRODUCT_ID_PATTERN = re.compile(r"product_id=(\d+)")
+ORDER_ID_PATTERN = re.compile(r"order_id=(\d+)")
+
+
+def parse_id(pattern, url):
+    match = pattern.search(url or "")
+    return match.group(1) if match else None
+
+
+def parse_int(text):
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        return None
+
+
+class Record:
+    
+    # Field names to leave out of repr, such as element handles
+    HANDLES = ()
+    
+    __slots__ = ()
+    
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+    
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+    
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self.__slots__ if name not in self.HANDLES
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+class ProductRecord(Record):
+    
+    HANDLES = ("add_to_cart_button", "wishlist_button", "compare_button")
+    
+    __slots__ = ("name", "price", "product_id") + HANDLES
+
+
+class CartRecord(Record):
+    
+    HANDLES = ("quantity_input", "update_button", "remove_button")
+    
+    __slots__ = ("name", "model", "quantity", "unit_price", "total", "product_id") + HANDLES
+
+
+class OrderRecord(Record):
+    
+    HANDLES = ("view_button",)
+    
+    __slots__ = ("order_id", "customer", "quantity", "status", "total", "date_added") + HANDLES
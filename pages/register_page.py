@@ -22,6 +22,8 @@ class RegisterPage(BasePage):
     NEWSLETTER_YES_RADIO = (By.CSS_SELECTOR, "input[name='newsletter'][value='1']")
     NEWSLETTER_NO_RADIO = (By.CSS_SELECTOR, "input[name='newsletter'][value='0']")
     
+    READY_LOCATORS = (FIRST_NAME_INPUT,)
+    
     def __init__(self, driver):
         super().__init__(driver)
     
@@ -29,19 +31,22 @@ class RegisterPage(BasePage):
                  subscribe_newsletter=False):
         logger.info(f"Registering new user: {email}")
         
-        self.send_keys_to_element(self.FIRST_NAME_INPUT, first_name)
-        self.send_keys_to_element(self.LAST_NAME_INPUT, last_name)
-        self.send_keys_to_element(self.EMAIL_INPUT, email)
-        self.send_keys_to_element(self.TELEPHONE_INPUT, telephone)
-        self.send_keys_to_element(self.PASSWORD_INPUT, password)
-        self.send_keys_to_element(self.PASSWORD_CONFIRM_INPUT, password)
-        
         if subscribe_newsletter:
-            self.click_element(self.NEWSLETTER_YES_RADIO)
+            newsletter_radio = self.NEWSLETTER_YES_RADIO
         else:
-            self.click_element(self.NEWSLETTER_NO_RADIO)
+            newsletter_radio = self.NEWSLETTER_NO_RADIO
+        
+        self.fill_form({
+            self.FIRST_NAME_INPUT: first_name,
+            self.LAST_NAME_INPUT: last_name,
+            self.EMAIL_INPUT: email,
+            self.TELEPHONE_INPUT: telephone,
+            self.PASSWORD_INPUT: password,
+            self.PASSWORD_CONFIRM_INPUT: password,
+            newsletter_radio: True,
+            self.PRIVACY_POLICY_CHECKBOX: True
+        })
         
-        self.click_element(self.PRIVACY_POLICY_CHECKBOX)
         self.click_element(self.CONTINUE_BUTTON)
         
         from .account_page import AccountPage
@@ -0,0 +1,26 @@
+from urllib.parse import urlencode
+
+
+# OpenCart route of each page object, keyed by class name so this module needs no page imports
+ROUTES = {
+    "HomePage": "common/home",
+    "LoginPage": "account/login",
+    "RegisterPage": "account/register",
+    "AccountPage": "account/account",
+    "EditAccountPage": "account/edit",
+    "OrderHistoryPage": "account/order",
+    "CartPage": "checkout/cart",
+    "CheckoutPage": "checkout/checkout",
+    "SearchResultsPage": "product/search",
+    "ProductPage": "product/product"
+}
+
+
+def route_path(page_class, **params):
+    name = page_class if isinstance(page_class, str) else page_class.__name__
+    if name not in ROUTES:
+        raise ValueError(f"No route registered for {name}")
+    
+    query = {"route": ROUTES[name]}
+    query.update({key: value for key, value in params.items() if value is not None})
+    return f"/index.php?{urlencode(query, safe='/')}"
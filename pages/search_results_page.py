@@ -1,6 +1,8 @@
 
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
+from .records import PRODUCT_ID_PATTERN, ProductRecord, parse_id
+from utils.wait_helpers import Condition
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,22 +21,77 @@ class SearchResultsPage(BasePage):
     GRID_VIEW_BUTTON = (By.ID, "grid-view")
     LIST_VIEW_BUTTON = (By.ID, "list-view")
     SUCCESS_MESSAGE = (By.CSS_SELECTOR, ".alert-success")
+    NEXT_PAGE_LINK = (By.CSS_SELECTOR, "ul.pagination li.active + li a")
+    
+    READY_LOCATORS = (PRODUCT_ITEMS, NO_RESULTS_MESSAGE)
+    
+    # Fields read from each PRODUCT_ITEMS card by rows()
+    ROW_FIELDS = {
+        "name": ("h4 a", "text"),
+        "link": ("h4 a", "href"),
+        "price": (".price", "text"),
+        "price_new": (".price-new", "text"),
+        "add_to_cart_button": ("button[onclick*='cart.add']", "element"),
+        "wishlist_button": ("button[onclick*='wishlist.add']", "element"),
+        "compare_button": ("button[onclick*='compare.add']", "element")
+    }
     
     def __init__(self, driver):
         super().__init__(driver)
     
+    @classmethod
+    def open(cls, driver, query=None, limit=None, sort=None, order=None, page=None,
+             search=None, **params):
+        # sort and order take OpenCart's values, e.g. sort="p.price", order="DESC"; params
+        # pass other search filters such as category_id or description=true. search is
+        # the route's own name for query, as accepted by BasePage.open
+        if query is not None and search is not None:
+            raise TypeError("Pass either query or search, not both")
+        return super().open(
+            driver, search=query if query is not None else search, limit=limit, sort=sort,
+            order=order, page=page, **params
+        )
+    
     def get_product_count(self):
-        elements = self.driver.find_elements(*self.PRODUCT_ITEMS)
-        count = len(elements)
+        count = self.count_elements(self.PRODUCT_ITEMS)
         logger.info(f"Found {count} products in search results")
         return count
     
     def get_product_names(self):
-        elements = self.driver.find_elements(*self.PRODUCT_NAMES)
-        names = [elem.text for elem in elements]
+        names = self.get_texts(self.PRODUCT_NAMES)
         logger.info(f"Product names: {names}")
         return names
     
+    def rows(self):
+        records = []
+        for row in self.get_rows(self.PRODUCT_ITEMS, self.ROW_FIELDS):
+            # .price also holds the "Ex Tax" line and, on sale, the old price
+            price = row["price_new"] or (row["price"] or "").split("\n")[0].strip()
+            records.append(ProductRecord(
+                name=row["name"],
+                price=price,
+                product_id=parse_id(PRODUCT_ID_PATTERN, row["link"]),
+                add_to_cart_button=row["add_to_cart_button"],
+                wishlist_button=row["wishlist_button"],
+                compare_button=row["compare_button"]
+            ))
+        logger.info(f"Read {len(records)} search result rows")
+        return records
+    
+    def iter_all_rows(self):
+        # Yields records page by page, following the pagination from the current page;
+        # only one page is held at a time and element handles go stale on the next page
+        page_number = 1
+        while True:
+            yield from self.rows()
+            
+            next_links = self.get_attributes(self.NEXT_PAGE_LINK, "href")
+            if not next_links:
+                return
+            page_number += 1
+            logger.info(f"Reading search results page {page_number}")
+            self.navigate_to(next_links[0])
+    
     def click_product_by_name(self, product_name):
         logger.info(f"Clicking product: {product_name}")
         product_locator = (By.LINK_TEXT, product_name)
@@ -45,7 +102,7 @@ class SearchResultsPage(BasePage):
     
     def click_first_product(self):
         logger.info("Clicking first product")
-        elements = self.driver.find_elements(*self.PRODUCT_NAMES)
+        elements = self.find_elements(self.PRODUCT_NAMES)
         if elements:
             elements[0].click()
             from .product_page import ProductPage
@@ -55,11 +112,11 @@ class SearchResultsPage(BasePage):
     
     def add_first_product_to_cart(self):
         logger.info("Adding first product to cart")
-        buttons = self.driver.find_elements(*self.ADD_TO_CART_BUTTONS)
-        if buttons:
-            buttons[0].click()
-            return self.is_success_message_displayed()
-        return False
+        if not self.count_elements(self.ADD_TO_CART_BUTTONS):
+            return False
+        self.click_and_wait_for_network(self.ADD_TO_CART_BUTTONS)
+        # The response has been handled, so the alert is already there or not coming
+        return self.is_element_visible(self.SUCCESS_MESSAGE, timeout=1)
     
     def is_success_message_displayed(self):
         return self.is_element_visible(self.SUCCESS_MESSAGE, timeout=5)
@@ -70,16 +127,15 @@ class SearchResultsPage(BasePage):
         return ""
     
     def is_no_results_displayed(self):
-        try:
-            message = self.get_element_text(self.NO_RESULTS_MESSAGE)
-            return "no product" in message.lower()
-        except:
-            return False
+        match = self.find_first_of(
+            [Condition(self.NO_RESULTS_MESSAGE, "text", "no product"), self.PRODUCT_ITEMS],
+            timeout=self.wait_helper.timeout
+        )
+        return match == 0
     
     def sort_by(self, sort_option):
         logger.info(f"Sorting by: {sort_option}")
         self.select_dropdown_by_text(self.SORT_DROPDOWN, sort_option)
     
     def is_page_loaded(self):
-        return self.is_element_present(self.PRODUCT_ITEMS, timeout=10) or \
-               self.is_element_present(self.NO_RESULTS_MESSAGE, timeout=10)
\ No newline at end of file
+        return self.find_first_of(self.READY_LOCATORS, timeout=10) is not None
\ No newline at end of file
@@ -0,0 +1,14 @@
+import pytest
+
+from utils.run_metrics import metrics
+
+
+@pytest.fixture
+def run_metrics():
+    # Unit tests feed fake numbers through the code the browser tests use, so they get an
+    # empty RunMetrics and the browser tests' numbers are put back afterwards
+    saved = metrics.snapshot()
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+    metrics.merge(saved)
@@ -1,20 +1,20 @@
 
 import pytest
 from datetime import datetime
+from pages.account_page import AccountPage
 from pages.home_page import HomePage
+from pages.order_history_page import OrderHistoryPage
 from utils.logger import log_test_start, log_test_end
 
 
 class TestAccount:
     
-    def test_update_account_information(self, driver, test_data):
+    def test_update_account_information(self, driver, login_as):
         log_test_start("test_update_account_information")
         
-        # Login
-        home_page = HomePage(driver)
-        login_page = home_page.go_to_login()
-        user = test_data['users']['valid_user']
-        account_page = login_page.login(user['email'], user['password'])
+        # Login (restores the saved session after the first login)
+        login_as("valid_user")
+        account_page = AccountPage.open(driver)
         
         # Go to edit account
         edit_account_page = account_page.go_to_edit_account()
@@ -29,17 +29,14 @@ class TestAccount:
         
         log_test_end("test_update_account_information", "PASSED")
     
-    def test_view_order_history(self, driver, test_data):
+    def test_view_order_history(self, driver, login_as):
         log_test_start("test_view_order_history")
         
-        # Login
-        home_page = HomePage(driver)
-        login_page = home_page.go_to_login()
-        user = test_data['users']['valid_user']
-        account_page = login_page.login(user['email'], user['password'])
+        # Login (restores the saved session after the first login)
+        login_as("valid_user")
         
-        # Go to order history
-        order_history_page = account_page.go_to_order_history()
+        # Open order history directly; test_account_navigation covers the links
+        order_history_page = OrderHistoryPage.open(driver)
         
         # Verify page loaded
         assert order_history_page.is_page_loaded(), \
@@ -54,14 +51,12 @@ class TestAccount:
         
         log_test_end("test_view_order_history", "PASSED")
     
-    def test_account_navigation(self, driver, test_data):
+    def test_account_navigation(self, driver, login_as):
         log_test_start("test_account_navigation")
         
-        # Login
-        home_page = HomePage(driver)
-        login_page = home_page.go_to_login()
-        user = test_data['users']['valid_user']
-        account_page = login_page.login(user['email'], user['password'])
+        # Login (restores the saved session after the first login)
+        login_as("valid_user")
+        account_page = AccountPage.open(driver)
         
         # Verify account page loaded
         assert account_page.is_logged_in(), "User should be logged in"
@@ -0,0 +1,451 @@
+import pytest
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException
+)
+
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
+from pages.header import Header
+from pages.home_page import HomePage
+from pages.records import CartRecord
+from pages.routes import route_path
+from pages.search_results_page import SearchResultsPage
+
+
+pytestmark = pytest.mark.usefixtures("run_metrics")
+
+
+class FakeDriver:
+    
+    capabilities = {"pageLoadStrategy": "normal"}
+    
+    def __init__(self, results=(), url="about:blank"):
+        self.results = list(results)
+        self.calls = []
+        self.current_url = url
+        self.visited = []
+    
+    def get(self, url):
+        self.visited.append(url)
+    
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class TestBulkExtraction:
+    
+    def test_texts_come_back_in_one_call(self):
+        driver = FakeDriver([["iPhone", "MacBook"]])
+        
+        assert CartPage(driver).get_product_names() == ["iPhone", "MacBook"]
+        assert len(driver.calls) == 1
+        by, value, ready, mode, _ = driver.calls[0]
+        assert (by, value) == CartPage.PRODUCT_NAMES
+        assert ready == [list(locator) for locator in CartPage.READY_LOCATORS]
+        assert mode == "text"
+    
+    def test_waits_for_ready_page_before_retrying(self):
+        # Not ready, then wait_for_any matches the first ready locator, then the read
+        driver = FakeDriver([None, 0, 3])
+        
+        assert CartPage(driver).get_cart_items_count() == 3
+        assert len(driver.calls) == 3
+        assert driver.calls[2][2] == []
+
+
+class TestRows:
+    
+    def test_cart_rows_are_built_from_one_query(self):
+        driver = FakeDriver([[{
+            "name": "iPhone",
+            "link": "https://demo.opencart.com/index.php?route=product/product&product_id=40",
+            "model": "product 11",
+            "quantity": "2",
+            "unit_price": "$123.20",
+            "total": "$246.40",
+            "quantity_input": "input-handle",
+            "update_button": "update-handle",
+            "remove_button": "remove-handle"
+        }]])
+        
+        rows = CartPage(driver).rows()
+        
+        assert len(driver.calls) == 1
+        assert rows == [CartRecord(
+            name="iPhone", model="product 11", quantity=2, unit_price="$123.20",
+            total="$246.40", product_id="40", quantity_input="input-handle",
+            update_button="update-handle", remove_button="remove-handle"
+        )]
+        assert "remove-handle" not in repr(rows[0])
+    
+    def test_search_rows_prefer_sale_price(self):
+        row = {
+            "name": "Apple Cinema 30\"",
+            "link": "index.php?route=product/product&product_id=42&search=apple",
+            "price": "$110.00 $122.00\nEx Tax: $90.00",
+            "price_new": "$110.00",
+            "add_to_cart_button": None,
+            "wishlist_button": None,
+            "compare_button": None
+        }
+        plain = dict(row, price="$122.00\nEx Tax: $100.00", price_new=None)
+        
+        first, second = SearchResultsPage(FakeDriver([[row, plain]])).rows()
+        
+        assert (first.product_id, first.price) == ("42", "$110.00")
+        assert second.price == "$122.00"
+
+
+class TestFillForm:
+    
+    def test_fields_are_set_in_one_call(self):
+        driver = FakeDriver([{"index": 2, "reason": None}])
+        page = CheckoutPage(driver)
+        
+        page.fill_form({page.FIRST_NAME_INPUT: "Test", page.COUNTRY_DROPDOWN: "United Kingdom"})
+        
+        assert len(driver.calls) == 1
+        fields, start = driver.calls[0]
+        assert start == 0
+        assert fields[1] == {
+            "by": "id", "value": "input-payment-country", "input": "United Kingdom", "typed": False
+        }
+    
+    def test_continues_after_option_loads(self):
+        driver = FakeDriver([
+            {"index": 1, "reason": "option", "options": ["--- Please Select ---"]},
+            {"index": 2, "reason": None}
+        ])
+        page = CheckoutPage(driver)
+        
+        page.fill_form({page.COUNTRY_DROPDOWN: "United Kingdom", page.REGION_DROPDOWN: "Kent"})
+        
+        assert [start for _, start in driver.calls] == [0, 1]
+    
+    def test_missing_option_is_reported_after_timeout(self):
+        driver = FakeDriver([{"index": 0, "reason": "option", "options": ["Kent"]}] * 50)
+        page = CheckoutPage(driver)
+        
+        with pytest.raises(NoSuchElementException, match="Kent"):
+            page.fill_form({page.REGION_DROPDOWN: "Atlantis"}, timeout=0.2)
+    
+    def test_typed_fields_get_real_keystrokes(self, monkeypatch):
+        driver = FakeDriver([{"index": 0, "reason": "typed"}, {"index": 2, "reason": None}])
+        page = CheckoutPage(driver)
+        typed = []
+        monkeypatch.setattr(page, "send_keys_to_element", lambda locator, text: typed.append(text))
+        
+        page.fill_form(
+            {page.POSTCODE_INPUT: "SW1A 1AA", page.CITY_INPUT: "London"},
+            typed=[page.POSTCODE_INPUT]
+        )
+        
+        assert typed == ["SW1A 1AA"]
+        assert driver.calls[1][1] == 1
+
+
+class TestDropdownSelection:
+    
+    def make_page(self, monkeypatch, result):
+        driver = FakeDriver([result])
+        page = CheckoutPage(driver)
+        monkeypatch.setattr(
+            page.wait_helper, "wait_for_element_visible", lambda locator, timeout: "select"
+        )
+        return page, driver
+    
+    def test_option_is_selected_in_one_call(self, monkeypatch):
+        page, driver = self.make_page(monkeypatch, None)
+        
+        page.select_dropdown_by_text(page.COUNTRY_DROPDOWN, "United Kingdom")
+        
+        assert driver.calls == [("select", "text", "United Kingdom")]
+    
+    def test_missing_option_lists_closest_texts(self, monkeypatch):
+        options = ["--- Please Select ---", "United Kingdom", "United States", "Uganda"]
+        page, _ = self.make_page(monkeypatch, options)
+        
+        with pytest.raises(NoSuchElementException) as error:
+            page.select_dropdown_by_text(page.COUNTRY_DROPDOWN, "United Kingdon")
+        
+        assert "closest: ['United Kingdom', 'United States']" in str(error.value)
+
+
+class TestCartReset:
+    
+    def make_driver(self, results, endpoint_ok=True):
+        driver = FakeDriver(results)
+        driver.posted = []
+        
+        def execute_async_script(script, url, keys):
+            driver.posted.append((url, keys))
+            return endpoint_ok
+        
+        driver.execute_async_script = execute_async_script
+        return driver
+    
+    def test_all_items_removed_through_endpoint(self):
+        # Cart keys, keys left after reloading the page, then the empty-cart check
+        driver = self.make_driver([["quantity[101]", "quantity[102]"], [], 0])
+        
+        assert CartPage(driver).remove_all_products()
+        assert driver.posted == [
+            ("https://demo.opencart.com/index.php?route=checkout/cart/remove", ["101", "102"])
+        ]
+        assert driver.visited == ["https://demo.opencart.com/index.php?route=checkout/cart"]
+    
+    def test_empty_cart_makes_no_requests(self):
+        driver = self.make_driver([[], 0])
+        
+        assert CartPage(driver).remove_all_products()
+        assert driver.posted == []
+        assert driver.visited == []
+    
+    def test_falls_back_to_clicking_remove_buttons(self):
+        # Cart keys, no remove buttons left to click, keys left, then the empty-cart check
+        driver = self.make_driver([["quantity[101]"], None, [], 0], endpoint_ok=False)
+        
+        assert CartPage(driver).remove_all_products()
+        assert len(driver.calls) == 4
+        assert driver.visited == []
+    
+    def test_items_left_behind_are_not_counted(self, run_metrics):
+        # One row survives the reload, so the empty-cart check finds cart items
+        driver = self.make_driver([["quantity[101]", "quantity[102]"], ["quantity[102]"], 1])
+        
+        assert not CartPage(driver).remove_all_products()
+        assert run_metrics.get("cart_reset.items") == 1
+    
+    def test_quantity_update_waits_for_the_page_reload(self, monkeypatch):
+        page = CartPage(FakeDriver())
+        events = []
+        
+        class Element:
+            def clear(self):
+                pass
+            
+            def send_keys(self, text):
+                events.append(("typed", text))
+            
+            def click(self):
+                events.append("submitted")
+            
+            def is_enabled(self):
+                # The row only goes stale once the form post has reloaded the page
+                if "submitted" in events:
+                    raise StaleElementReferenceException("row replaced")
+                return True
+        
+        monkeypatch.setattr(page, "find_elements", lambda locator: [Element()])
+        monkeypatch.setattr(page, "wait_until_ready", lambda: events.append("ready"))
+        
+        page.update_quantity(0, 2)
+        
+        assert events == [("typed", "2"), "submitted", "ready"]
+
+
+class TestHomePageNavigation:
+    
+    def test_attaches_when_already_on_the_store(self):
+        # The header search box is there
+        driver = FakeDriver([False], url="https://demo.opencart.com/index.php?route=product/search")
+        
+        HomePage(driver)
+        
+        assert driver.visited == []
+    
+    def test_navigates_from_a_store_document_without_header(self):
+        driver = FakeDriver([True], url="https://demo.opencart.com/robots.txt")
+        
+        HomePage(driver)
+        
+        assert driver.visited == ["https://demo.opencart.com/"]
+    
+    def test_navigates_from_a_blank_browser(self):
+        driver = FakeDriver()
+        
+        HomePage(driver)
+        
+        assert driver.visited == ["https://demo.opencart.com/"]
+    
+    def test_header_is_shared_by_every_page(self):
+        page = CartPage(FakeDriver(url="https://demo.opencart.com/"))
+        
+        assert isinstance(page.header, Header)
+        assert page.header is page.header
+
+
+class TestRoutes:
+    
+    def test_route_path_encodes_params(self):
+        assert route_path(SearchResultsPage, search="MacBook Air", limit=25, sort=None) == \
+            "/index.php?route=product/search&search=MacBook+Air&limit=25"
+    
+    def test_unregistered_page_is_rejected(self):
+        with pytest.raises(ValueError):
+            route_path(Header)
+    
+    def test_open_navigates_straight_to_route(self):
+        driver = FakeDriver()
+        
+        page = HomePage.open(driver)
+        
+        assert isinstance(page, HomePage)
+        assert driver.visited == ["https://demo.opencart.com/index.php?route=common/home"]
+    
+    def test_redirect_skips_readiness_wait_under_eager(self):
+        driver = FakeDriver(["complete"])
+        driver.capabilities = {"pageLoadStrategy": "eager"}
+        driver.get = lambda url: setattr(
+            driver, "current_url", "https://demo.opencart.com/index.php?route=checkout/cart"
+        )
+        
+        CheckoutPage.open(driver)
+        
+        # Only the document-ready check ran; CheckoutPage's ready locators were never waited on
+        assert driver.calls == [()]
+    
+    def test_readiness_timeout_under_eager_is_not_fatal(self):
+        driver = FakeDriver(
+            [-1] * 10, url="https://demo.opencart.com/index.php?route=checkout/cart"
+        )
+        driver.capabilities = {"pageLoadStrategy": "eager"}
+        page = CartPage(driver)
+        page.wait_helper.ANY_POLL_INTERVAL = 0.01
+        page.wait_helper.timeout = 0.05
+        
+        page.navigate_to("/index.php?route=checkout/cart")
+        
+        # The ready locators were polled until the timeout, which was logged, not raised
+        assert len(driver.calls) > 1
+
+
+class TestCheckoutSteps:
+    
+    @staticmethod
+    def states(*steps):
+        return [{"step": step, "errors": []} for step in steps]
+    
+    def make_page(self, monkeypatch, states):
+        page = CheckoutPage(FakeDriver(states))
+        page.clicked = []
+        monkeypatch.setattr(page, "select_guest_checkout", lambda: page.clicked.append("guest"))
+        monkeypatch.setattr(
+            page, "fill_billing_details", lambda *args: page.clicked.append("billing")
+        )
+        monkeypatch.setattr(page, "click_element", lambda locator: page.clicked.append(locator[1]))
+        monkeypatch.setattr(page, "count_elements", lambda locator: 0)
+        monkeypatch.setattr(page, "is_order_success", lambda: True)
+        return page
+    
+    def test_skipped_steps_are_never_waited_for(self, monkeypatch):
+        page = self.make_page(monkeypatch, self.states(
+            "checkout-option", "payment-address", "shipping-method", "payment-method",
+            "checkout-confirm", "success"
+        ))
+        
+        assert page.complete_guest_checkout({"email": "guest@example.com"}) is True
+        assert page.clicked == [
+            "guest", "billing", "button-shipping-method", "button-payment-method", "button-confirm"
+        ]
+        assert [step for step, _ in page.step_timings] == [
+            "checkout-option", "payment-address", "shipping-method", "payment-method",
+            "checkout-confirm"
+        ]
+    
+    def test_validation_errors_stop_the_checkout(self, monkeypatch):
+        error = {
+            "step": "payment-address", "errors": ["E-Mail Address does not appear to be valid!"]
+        }
+        states = self.states("checkout-option", "payment-address") + [error]
+        page = self.make_page(monkeypatch, states)
+        
+        assert page.complete_guest_checkout({"email": "invalid"}) is False
+        assert page.clicked == ["guest", "billing"]
+    
+    def test_unloaded_document_is_probed_again(self, monkeypatch):
+        unloaded = JavascriptException("javascript error: document unloaded while waiting")
+        page = self.make_page(monkeypatch, self.states("checkout-confirm") + [
+            unloaded, {"step": "success", "errors": []}
+        ])
+        
+        assert page.complete_guest_checkout({}) is True
+        assert page.clicked == ["button-confirm"]
+    
+    def test_other_probe_errors_are_raised(self, monkeypatch):
+        page = self.make_page(monkeypatch, [JavascriptException("javascript error: boom")])
+        
+        with pytest.raises(JavascriptException):
+            page.wait_for_step(("success",))
+    
+    def test_page_with_saved_address_is_loaded_for_logged_in_customer(self):
+        driver = FakeDriver()
+        
+        def execute_script(script, conditions):
+            # Only the saved-address continue button is visible; the guest fields are hidden
+            values = [condition["value"] for condition in conditions]
+            return values.index("button-payment-address")
+        
+        driver.execute_script = execute_script
+        
+        assert CheckoutPage(driver).is_page_loaded()
+    
+    def test_logged_in_customer_continues_with_saved_address(self, monkeypatch):
+        page = self.make_page(monkeypatch, self.states(
+            "payment-address", "shipping-address", "shipping-method", "payment-method",
+            "checkout-confirm", "success"
+        ))
+        monkeypatch.setattr(
+            page, "count_elements", lambda locator: locator == page.PAYMENT_ADDRESS_CONTINUE
+        )
+        
+        assert page.complete_guest_checkout({}) is True
+        assert page.clicked[:2] == ["button-payment-address", "button-shipping-address"]
+        assert "billing" not in page.clicked
+
+
+class TestSearchPagination:
+    
+    def test_open_builds_search_route(self):
+        driver = FakeDriver()
+        
+        SearchResultsPage.open(driver, "mac book", limit=50, sort="p.price", order="DESC", page=2)
+        
+        assert driver.visited == [
+            "https://demo.opencart.com/index.php?route=product/search&search=mac+book"
+            "&limit=50&sort=p.price&order=DESC&page=2"
+        ]
+    
+    def test_open_accepts_route_search_param(self):
+        driver = FakeDriver()
+        
+        SearchResultsPage.open(driver, search="iPhone")
+        
+        assert driver.visited == [
+            "https://demo.opencart.com/index.php?route=product/search&search=iPhone"
+        ]
+        with pytest.raises(TypeError):
+            SearchResultsPage.open(driver, "iPhone", search="iPhone")
+    
+    def test_rows_are_streamed_page_by_page(self, monkeypatch):
+        page = SearchResultsPage(FakeDriver())
+        pages = [["MacBook", "MacBook Air"], ["MacBook Pro"]]
+        next_links = [["https://demo.opencart.com/index.php?route=product/search&page=2"], []]
+        visited = []
+        monkeypatch.setattr(page, "rows", lambda: pages[len(visited)])
+        monkeypatch.setattr(
+            page, "get_attributes", lambda locator, attribute: next_links[len(visited)]
+        )
+        monkeypatch.setattr(page, "navigate_to", visited.append)
+        
+        records = page.iter_all_rows()
+        assert next(records) == "MacBook"
+        assert visited == []
+        assert list(records) == ["MacBook Air", "MacBook Pro"]
+        assert visited == ["https://demo.opencart.com/index.php?route=product/search&page=2"]
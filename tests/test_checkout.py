@@ -1,6 +1,8 @@
 
 import pytest
 from datetime import datetime
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
 from pages.home_page import HomePage
 from utils.logger import log_test_start, log_test_end
 
@@ -9,19 +11,15 @@ from utils.logger import log_test_start, log_test_end
 class TestCheckout:
     
     @pytest.mark.smoke
-    def test_guest_checkout(self, driver, test_data):
+    def test_guest_checkout(self, driver, test_data, seed):
         log_test_start("test_guest_checkout")
         
-        # Add product to cart
-        home_page = HomePage(driver)
-        search_term = test_data['products']['search_terms']['valid'][0]
-        search_results = home_page.search_product(search_term)
-        product_page = search_results.click_first_product()
-        product_page.add_to_cart()
+        # Seed the cart over HTTP and hand the session to the browser
+        seed.add_to_cart(test_data['products']['products'][0]['product_id'])
+        seed.apply(driver)
         
-        # Go to cart and proceed to checkout
-        cart_page = home_page.go_to_shopping_cart()
-        checkout_page = cart_page.proceed_to_checkout()
+        # Start on checkout; test_proceed_to_checkout_button covers the cart button
+        checkout_page = CheckoutPage.open(driver)
         
         # Complete guest checkout
         guest_user = test_data['users']['guest_user'].copy()
@@ -56,18 +54,15 @@ class TestCheckout:
         
         log_test_end("test_checkout_with_empty_cart", "PASSED")
     
-    def test_proceed_to_checkout_button(self, driver, test_data):
+    def test_proceed_to_checkout_button(self, driver, test_data, seed):
         log_test_start("test_proceed_to_checkout_button")
         
-        # Add product to cart
-        home_page = HomePage(driver)
-        search_term = test_data['products']['search_terms']['valid'][0]
-        search_results = home_page.search_product(search_term)
-        product_page = search_results.click_first_product()
-        product_page.add_to_cart()
+        # Seed the cart over HTTP and hand the session to the browser
+        seed.add_to_cart(test_data['products']['products'][0]['product_id'])
+        seed.apply(driver)
         
         # Go to cart
-        cart_page = home_page.go_to_shopping_cart()
+        cart_page = CartPage.open(driver)
         assert cart_page.get_cart_items_count() > 0, "Cart should have items"
         
         # Click checkout button
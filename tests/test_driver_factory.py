@@ -0,0 +1,30 @@
+import pytest
+
+from utils.driver_factory import DriverFactory
+
+
+pytestmark = pytest.mark.usefixtures("run_metrics")
+
+
+class TestPerformanceProfiles:
+    
+    def test_default_profile_is_standard(self):
+        assert DriverFactory.get_profile()["name"] == "standard"
+    
+    def test_config_selects_profile(self):
+        profile = DriverFactory.get_profile(config={"performance_profile": "lean"})
+        
+        assert profile["name"] == "lean"
+        assert profile["headless_argument"] == "--headless=new"
+        assert "--disable-background-networking" in profile["chrome_arguments"]
+    
+    def test_config_overrides_builtin_profile(self):
+        config = {"performance_profiles": {"lean": {"headless": False}}}
+        profile = DriverFactory.get_profile("lean", config)
+        
+        assert profile["headless"] is False
+        assert "--disable-component-update" in profile["chrome_arguments"]
+    
+    def test_unknown_profile_raises(self):
+        with pytest.raises(ValueError, match="Unknown performance profile"):
+            DriverFactory.get_profile("turbo")
@@ -0,0 +1,187 @@
+import threading
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from utils.driver_pool import DriverPool, StandbyDriverPool
+
+
+pytestmark = pytest.mark.usefixtures("run_metrics")
+
+
+class FakeSwitchTo:
+    
+    def __init__(self, driver):
+        self.driver = driver
+    
+    def window(self, handle):
+        self.driver.current_handle = handle
+
+
+class FakeDriver:
+    
+    def __init__(self):
+        self.handles = ["main"]
+        self.current_handle = "main"
+        self.switch_to = FakeSwitchTo(self)
+        self.alive = True
+        self.cookies_cleared = 0
+        self.scripts = []
+        self.url = "https://demo.opencart.com/"
+        self.visited = []
+        self.quit_called = False
+    
+    @property
+    def current_url(self):
+        return self.url
+    
+    @property
+    def window_handles(self):
+        if not self.alive:
+            raise WebDriverException("session deleted")
+        return list(self.handles)
+    
+    def close(self):
+        self.handles.remove(self.current_handle)
+    
+    def execute_script(self, script):
+        self.scripts.append(script)
+    
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+    
+    def get(self, url):
+        self.visited.append(url)
+        self.url = url
+    
+    def quit(self):
+        self.quit_called = True
+
+
+class TestDriverPool:
+    
+    def test_released_driver_is_reused(self, run_metrics):
+        pool = DriverPool(FakeDriver)
+        first = pool.acquire()
+        pool.release(first)
+        
+        assert pool.acquire() is first
+        assert run_metrics.get("driver_pool.launches") == 1
+        assert run_metrics.get("driver_pool.launches_avoided") == 1
+    
+    def test_release_resets_browser_state(self):
+        pool = DriverPool(FakeDriver)
+        driver = pool.acquire()
+        driver.handles.append("popup")
+        driver.current_handle = "popup"
+        
+        pool.release(driver)
+        
+        assert driver.handles == ["main"]
+        assert driver.current_handle == "main"
+        assert driver.cookies_cleared == 1
+        assert "localStorage.clear()" in driver.scripts[0]
+        assert driver.url == "about:blank"
+    
+    def test_store_origin_is_cleared_when_test_ended_elsewhere(self):
+        pool = DriverPool(FakeDriver)
+        driver = pool.acquire()
+        driver.base_url = "https://demo.opencart.com"
+        driver.url = "about:blank"
+        
+        pool.release(driver)
+        
+        assert driver.visited == ["https://demo.opencart.com/robots.txt", "about:blank"]
+        assert driver.cookies_cleared == 1
+    
+    def test_chrome_clears_store_origin_over_cdp(self):
+        pool = DriverPool(FakeDriver)
+        driver = pool.acquire()
+        driver.base_url = "https://demo.opencart.com"
+        driver.url = "data:,"
+        driver.cdp_commands = []
+        driver.execute_cdp_cmd = lambda cmd, params: driver.cdp_commands.append((cmd, params))
+        
+        pool.release(driver)
+        
+        assert driver.visited == ["about:blank"]
+        assert driver.cdp_commands[-1] == (
+            "Storage.clearDataForOrigin",
+            {"origin": "https://demo.opencart.com", "storageTypes": "all"}
+        )
+    
+    def test_dead_session_falls_back_to_relaunch(self, run_metrics):
+        pool = DriverPool(FakeDriver)
+        first = pool.acquire()
+        pool.release(first)
+        first.alive = False
+        
+        second = pool.acquire()
+        
+        assert second is not first
+        assert first.quit_called
+        assert run_metrics.get("driver_pool.launches") == 2
+        assert run_metrics.get("driver_pool.launches_avoided") == 0
+    
+    def test_failed_reset_discards_driver(self, run_metrics):
+        pool = DriverPool(FakeDriver)
+        driver = pool.acquire()
+        driver.alive = False
+        
+        pool.release(driver)
+        
+        assert driver.quit_called
+        assert run_metrics.get("driver_pool.reset_failures") == 1
+        assert pool.acquire() is not driver
+
+
+class TestStandbyDriverPool:
+    
+    def test_next_browser_is_launched_in_background(self, run_metrics):
+        pool = StandbyDriverPool(FakeDriver, depth=1)
+        first = pool.acquire()
+        
+        # The replacement is already being warmed while the first one is in use
+        pool._pending[0].result(timeout=5)
+        second = pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        pool.close_all()
+        
+        assert second is not first
+        assert first.quit_called and second.quit_called
+        assert run_metrics.get("standby.warm_hits") >= 1
+        assert run_metrics.get("standby.launches") >= 2
+    
+    def test_wait_for_slow_launch_is_recorded(self, run_metrics):
+        launch_gate = threading.Event()
+        
+        def slow_launcher():
+            launch_gate.wait(timeout=5)
+            return FakeDriver()
+        
+        pool = StandbyDriverPool(slow_launcher, depth=1)
+        threading.Timer(0.05, launch_gate.set).start()
+        driver = pool.acquire()
+        pool.release(driver)
+        pool.close_all()
+        
+        assert run_metrics.get("standby.waits") == 1
+        assert run_metrics.get("standby.wait.count") == 1
+        assert run_metrics.get("standby.wait.max") > 0
+    
+    def test_close_all_quits_warm_browsers(self):
+        launched = []
+        
+        def launcher():
+            driver = FakeDriver()
+            launched.append(driver)
+            return driver
+        
+        pool = StandbyDriverPool(launcher, depth=2)
+        pool._pending[0].result(timeout=5)
+        pool._pending[1].result(timeout=5)
+        pool.close_all()
+        
+        assert len(launched) == 2
+        assert all(driver.quit_called for driver in launched)
@@ -0,0 +1,107 @@
+import json
+import os
+import time
+
+import pytest
+
+from utils.driver_resolver import DriverResolver
+
+
+pytestmark = pytest.mark.usefixtures("run_metrics")
+
+
+@pytest.fixture
+def fake_binary(tmp_path):
+    binary = tmp_path / "chromedriver"
+    binary.write_text("")
+    return str(binary)
+
+
+class TestDriverResolver:
+    
+    def test_configured_path_skips_lookup(self, tmp_path, fake_binary, monkeypatch):
+        monkeypatch.setattr(DriverResolver, "_install_with_manager", staticmethod(
+            lambda browser: pytest.fail("driver manager should not be called")
+        ))
+        resolver = DriverResolver(cache_dir=str(tmp_path), driver_paths={"chrome": fake_binary})
+        
+        assert resolver.resolve("chrome") == fake_binary
+    
+    def test_missing_configured_path_raises(self, tmp_path):
+        resolver = DriverResolver(
+            cache_dir=str(tmp_path),
+            driver_paths={"chrome": str(tmp_path / "missing")}
+        )
+        
+        with pytest.raises(FileNotFoundError):
+            resolver.resolve("chrome")
+    
+    def test_manifest_is_shared_between_resolvers(self, tmp_path, fake_binary, monkeypatch):
+        calls = []
+        
+        def install(browser):
+            calls.append(browser)
+            return fake_binary
+        
+        monkeypatch.setattr(DriverResolver, "_install_with_manager", staticmethod(install))
+        
+        # Two resolvers stand in for two xdist workers sharing the cache directory
+        first = DriverResolver(cache_dir=str(tmp_path))
+        second = DriverResolver(cache_dir=str(tmp_path))
+        
+        assert first.resolve("chrome") == fake_binary
+        assert second.resolve("chrome") == fake_binary
+        assert first.resolve("chrome") == fake_binary
+        assert calls == ["chrome"]
+    
+    def test_stale_entry_used_when_offline(self, tmp_path, fake_binary, monkeypatch):
+        manifest_path = os.path.join(str(tmp_path), "driver_manifest.json")
+        with open(manifest_path, 'w') as f:
+            json.dump({"chrome": {"path": fake_binary, "resolved_at": 0}}, f)
+        
+        def install(browser):
+            raise ConnectionError("offline")
+        
+        monkeypatch.setattr(DriverResolver, "_install_with_manager", staticmethod(install))
+        resolver = DriverResolver(cache_dir=str(tmp_path))
+        
+        assert resolver.resolve("chrome") == fake_binary
+    
+    def test_browser_update_makes_entry_stale(self, tmp_path, fake_binary, monkeypatch):
+        manifest_path = os.path.join(str(tmp_path), "driver_manifest.json")
+        with open(manifest_path, 'w') as f:
+            json.dump({"chrome": {
+                "path": fake_binary, "browser_version": "119", "resolved_at": time.time()
+            }}, f)
+        calls = []
+        
+        def install(browser):
+            calls.append(browser)
+            return fake_binary
+        
+        monkeypatch.setattr(DriverResolver, "_install_with_manager", staticmethod(install))
+        monkeypatch.setattr(
+            DriverResolver, "_browser_major_version", staticmethod(lambda browser: "120")
+        )
+        resolver = DriverResolver(cache_dir=str(tmp_path))
+        
+        assert resolver.resolve("chrome") == fake_binary
+        assert calls == ["chrome"]
+        with open(manifest_path) as f:
+            assert json.load(f)["chrome"]["browser_version"] == "120"
+    
+    def test_invalidate_drops_the_manifest_entry(self, tmp_path, fake_binary, monkeypatch):
+        calls = []
+        
+        def install(browser):
+            calls.append(browser)
+            return fake_binary
+        
+        monkeypatch.setattr(DriverResolver, "_install_with_manager", staticmethod(install))
+        resolver = DriverResolver(cache_dir=str(tmp_path))
+        resolver.resolve("chrome")
+        
+        resolver.invalidate("chrome")
+        resolver.resolve("chrome")
+        
+        assert calls == ["chrome", "chrome"]
@@ -1,6 +1,7 @@
 
 import pytest
 from datetime import datetime
+from pages.account_page import AccountPage
 from pages.home_page import HomePage
 from utils.logger import log_test_start, log_test_end
 
@@ -39,18 +40,15 @@ class TestE2EFlows:
         
         log_test_end("test_complete_purchase_flow_guest", "PASSED")
     
-    def test_login_search_add_to_cart_logout(self, driver, test_data):
+    def test_login_search_add_to_cart_logout(self, driver, test_data, login_as):
         log_test_start("test_login_search_add_to_cart_logout")
         
-        # Step 1: Login
-        home_page = HomePage(driver)
-        login_page = home_page.go_to_login()
-        user = test_data['users']['valid_user']
-        account_page = login_page.login(user['email'], user['password'])
-        assert account_page.is_logged_in(), "User should be logged in"
+        # Step 1: Login (restores the saved session after the first login)
+        login_as("valid_user")
         
         # Step 2: Search for product
-        home_page = HomePage(driver)
+        home_page = HomePage(driver, navigate=True)
+        assert home_page.is_user_logged_in(), "User should be logged in"
         search_term = test_data['products']['search_terms']['valid'][1]
         search_results = home_page.search_product(search_term)
         
@@ -71,14 +69,12 @@ class TestE2EFlows:
         
         log_test_end("test_login_search_add_to_cart_logout", "PASSED")
     
-    def test_login_update_profile_view_orders(self, driver, test_data):
+    def test_login_update_profile_view_orders(self, driver, login_as):
         log_test_start("test_login_update_profile_view_orders")
         
-        # Step 1: Login
-        home_page = HomePage(driver)
-        login_page = home_page.go_to_login()
-        user = test_data['users']['valid_user']
-        account_page = login_page.login(user['email'], user['password'])
+        # Step 1: Login (restores the saved session after the first login)
+        login_as("valid_user")
+        account_page = AccountPage.open(driver)
         assert account_page.is_logged_in(), "User should be logged in"
         
         # Step 2: Update profile
@@ -115,6 +111,7 @@ class TestE2EFlows:
                 product_name = product_page.get_product_name()
                 product_page.add_to_cart()
                 added_products.append(product_name)
+                # Attaches to the product page; the header works from there
                 home_page = HomePage(driver)
         
         # Verify all products in cart
@@ -0,0 +1,87 @@
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+
+from utils.element_cache import ElementCache
+
+
+pytestmark = pytest.mark.usefixtures("run_metrics")
+
+
+class FakeDriver:
+    
+    def __init__(self):
+        self.url = "https://demo.opencart.com/index.php?route=checkout/checkout"
+        self.stale = set()
+        self.hidden = set()
+        self.calls = 0
+    
+    @property
+    def current_url(self):
+        return self.url
+    
+    def execute_script(self, script, element, state):
+        self.calls += 1
+        if element in self.stale:
+            raise StaleElementReferenceException("element is not attached to the page document")
+        return [element not in self.hidden, self.url]
+
+
+LOCATOR = ("id", "input-payment-firstname")
+
+
+class TestElementCache:
+    
+    def test_hit_after_put_costs_one_validation(self, run_metrics):
+        driver = FakeDriver()
+        cache = ElementCache(driver)
+        
+        assert cache.get(LOCATOR) is None
+        cache.put(LOCATOR, "first-name")
+        
+        assert cache.get(LOCATOR) == "first-name"
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert driver.calls == 1
+        assert run_metrics.get("element_cache.hits") == 1
+    
+    def test_url_change_clears_cache(self, run_metrics):
+        driver = FakeDriver()
+        cache = ElementCache(driver)
+        cache.put(LOCATOR, "first-name")
+        assert cache.get(LOCATOR) == "first-name"
+        
+        driver.url = "https://demo.opencart.com/index.php?route=checkout/success"
+        
+        assert cache.get(LOCATOR) is None
+        assert cache.get(LOCATOR) is None
+        assert run_metrics.get("element_cache.invalidations") == 1
+    
+    def test_url_change_before_first_validation_is_a_miss(self, run_metrics):
+        driver = FakeDriver()
+        cache = ElementCache(driver)
+        cache.put(LOCATOR, "first-name")
+        
+        driver.url = "https://demo.opencart.com/index.php?route=checkout/checkout#payment"
+        
+        assert cache.get(LOCATOR) is None
+        assert run_metrics.get("element_cache.invalidations") == 1
+    
+    def test_stale_element_clears_cache(self):
+        driver = FakeDriver()
+        cache = ElementCache(driver)
+        cache.put(LOCATOR, "first-name")
+        cache.put(("id", "input-payment-lastname"), "last-name")
+        driver.stale.add("first-name")
+        
+        assert cache.get(LOCATOR) is None
+        assert cache.get(("id", "input-payment-lastname")) is None
+        assert cache.misses == 2
+    
+    def test_hidden_element_is_located_again(self):
+        driver = FakeDriver()
+        cache = ElementCache(driver)
+        cache.put(LOCATOR, "first-name")
+        driver.hidden.add("first-name")
+        
+        assert cache.get(LOCATOR) is None
+        driver.hidden.clear()
+        assert cache.get(LOCATOR) is None
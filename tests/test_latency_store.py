@@ -0,0 +1,71 @@
+import pytest
+
+from pages.cart_page import CartPage
+from utils.latency_store import LatencyStore, locator_key
+
+
+pytestmark = pytest.mark.usefixtures("run_metrics")
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / "wait_latency.sqlite3")
+
+
+class TestLatencyStore:
+    
+    def test_locator_key_uses_page_constant_name(self):
+        assert locator_key(CartPage, CartPage.CHECKOUT_BUTTON) == "CartPage.CHECKOUT_BUTTON"
+        assert locator_key(CartPage, ("id", "unknown")) == "CartPage:id=unknown"
+    
+    def test_default_timeout_until_enough_samples(self, store_path):
+        recorder = LatencyStore(store_path, run_id="first")
+        for _ in range(5):
+            recorder.record("CartPage.CHECKOUT_BUTTON:clickable", 0.4)
+        recorder.flush()
+        
+        store = LatencyStore(store_path, run_id="second", adaptive=True, min_samples=10)
+        assert store.timeout_for("CartPage.CHECKOUT_BUTTON:clickable", 10) == 10
+    
+    def test_learned_timeout_is_p99_plus_margin(self, store_path):
+        recorder = LatencyStore(store_path, run_id="first")
+        for index in range(100):
+            recorder.record("CartPage.CHECKOUT_BUTTON:clickable", 0.5 if index < 99 else 3.0)
+        recorder.flush()
+        
+        store = LatencyStore(store_path, run_id="second", adaptive=True, margin=1.0, min_timeout=0)
+        assert store.timeout_for("CartPage.CHECKOUT_BUTTON:clickable", 10) == pytest.approx(1.5)
+        
+        store = LatencyStore(store_path, run_id="third", adaptive=True, min_timeout=2)
+        assert store.timeout_for("CartPage.CHECKOUT_BUTTON:clickable", 10) == 2
+    
+    def test_regressions_compare_against_earlier_runs(self, store_path):
+        earlier = LatencyStore(store_path, run_id="earlier")
+        for _ in range(3):
+            earlier.record("CartPage.CART_ITEMS:visible", 0.5)
+            earlier.record("CartPage.CART_TOTAL:visible", 0.5)
+        earlier.flush()
+        
+        current = LatencyStore(store_path, run_id="current")
+        for _ in range(3):
+            current.record("CartPage.CART_ITEMS:visible", 2.5)
+            current.record("CartPage.CART_TOTAL:visible", 0.6)
+        current.flush()
+        
+        assert current.regressions() == [("CartPage.CART_ITEMS:visible", 0.5, 2.5)]
+    
+    def test_controller_sees_samples_of_every_worker(self, store_path):
+        earlier = LatencyStore(store_path, run_id="earlier")
+        for _ in range(3):
+            earlier.record("CartPage.CART_ITEMS:visible", 0.5)
+        earlier.flush()
+        
+        # Two workers each flush half of the run's samples under the controller's run id
+        config = {"wait_latency": {"path": store_path}}
+        for _ in range(2):
+            worker = LatencyStore.from_config(config, run_id="current")
+            worker.record("CartPage.CART_ITEMS:visible", 2.5)
+            worker.flush()
+        
+        controller = LatencyStore.from_config(config, run_id="current")
+        assert controller.regressions() == [("CartPage.CART_ITEMS:visible", 0.5, 2.5)]
@@ -1,5 +1,6 @@
 import pytest
 from pages.home_page import HomePage
+from pages.login_page import LoginPage
 from utils.logger import log_test_start, log_test_end
 
 
@@ -26,9 +27,8 @@ class TestLogin:
     def test_invalid_login(self, driver, test_data):
         log_test_start("test_invalid_login")
         
-        # Navigate to login page
-        home_page = HomePage(driver)
-        login_page = home_page.go_to_login()
+        # Open login page directly
+        login_page = LoginPage.open(driver)
         
         # Attempt login with invalid credentials
         user = test_data['users']['invalid_user']
@@ -44,9 +44,8 @@ class TestLogin:
     def test_login_with_empty_credentials(self, driver):
         log_test_start("test_login_with_empty_credentials")
         
-        # Navigate to login page
-        home_page = HomePage(driver)
-        login_page = home_page.go_to_login()
+        # Open login page directly
+        login_page = LoginPage.open(driver)
         
         # Attempt login with empty credentials
         login_page.login("", "")
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from utils.network_blocker import NetworkBlocker
+
+
+pytestmark = pytest.mark.usefixtures("run_metrics")
+
+
+def perf_entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+class FakeChromeDriver:
+    
+    def __init__(self, entries):
+        self.entries = entries
+        self.cdp_commands = []
+    
+    def get_log(self, log_type):
+        assert log_type == "performance"
+        entries, self.entries = self.entries, []
+        return entries
+    
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_commands.append((cmd, params))
+
+
+class TestNetworkBlocker:
+    
+    @pytest.fixture(autouse=True)
+    def clean_state(self, monkeypatch):
+        monkeypatch.setattr(NetworkBlocker, "_type_sizes", {})
+    
+    def test_apply_sets_blocked_urls_via_cdp(self):
+        driver = FakeChromeDriver([])
+        
+        assert NetworkBlocker.apply(driver, ["*.png"])
+        assert driver.cdp_commands[-1] == ("Network.setBlockedURLs", {"urls": ["*.png"]})
+    
+    def test_collect_stats_counts_blocked_requests_and_estimates_bytes(self, run_metrics):
+        driver = FakeChromeDriver([
+            perf_entry("Network.responseReceived", requestId="1", type="Image"),
+            perf_entry("Network.loadingFinished", requestId="1", encodedDataLength=4000),
+            perf_entry("Network.loadingFailed", requestId="2", type="Image",
+                       blockedReason="inspector"),
+            perf_entry("Network.loadingFailed", requestId="3", type="Image",
+                       blockedReason="inspector"),
+            perf_entry("Network.loadingFailed", requestId="4", type="XHR",
+                       errorText="net::ERR_ABORTED")
+        ])
+        
+        assert NetworkBlocker.collect_stats(driver) == 2
+        assert run_metrics.get("network_blocking.blocked_requests") == 2
+        assert run_metrics.get("network_blocking.bytes_saved_estimate") == 8000
+    
+    def test_firefox_prefs_cover_images_and_fonts_only(self):
+        prefs = NetworkBlocker.firefox_prefs(["*.png", "*.woff2", "*google-analytics.com*"])
+        
+        assert prefs == {
+            "permissions.default.image": 2,
+            "gfx.downloadable_fonts.enabled": False
+        }
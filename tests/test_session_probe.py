@@ -0,0 +1,45 @@
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from pages.header import Header
+from utils.session_probe import SessionProbe
+
+
+pytestmark = pytest.mark.usefixtures("run_metrics")
+
+
+class FakeDriver:
+    
+    base_url = "https://demo.opencart.com"
+    capabilities = {"pageLoadStrategy": "normal"}
+    
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+    
+    def execute_async_script(self, script, *args):
+        self.calls.append(args)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class TestSessionProbe:
+    
+    def test_probe_requests_account_route_from_store_origin(self, run_metrics):
+        driver = FakeDriver(True)
+        
+        assert SessionProbe(driver, "http://localhost:8080/shop").is_logged_in() is True
+        assert driver.calls == [
+            ("http://localhost:8080", "http://localhost:8080/shop/index.php?route=account/account")
+        ]
+        assert run_metrics.get("login_state.probe.count") == 1
+    
+    def test_probe_failure_is_unknown(self):
+        assert SessionProbe(FakeDriver(WebDriverException("no such window"))).is_logged_in() is None
+    
+    def test_header_skips_dropdown_when_probe_answers(self, monkeypatch):
+        header = Header(FakeDriver(False))
+        monkeypatch.setattr(header, "click_my_account", lambda: pytest.fail("dropdown clicked"))
+        
+        assert header.is_user_logged_in() is False
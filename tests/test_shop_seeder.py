@@ -0,0 +1,121 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from utils.shop_seeder import SeedError, ShopSeeder, create_http_pool
+
+
+pytestmark = pytest.mark.usefixtures("run_metrics")
+
+
+class StandInShop(BaseHTTPRequestHandler):
+    
+    # Answers the two OpenCart endpoints the seeder uses, keeping carts per session cookie
+    carts = {}
+    users = {"john.doe.test@example.com": "TestPass123!"}
+    
+    def do_POST(self):
+        route = parse_qs(urlsplit(self.path).query).get("route", [""])[0]
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode()
+        form = {key: values[0] for key, values in parse_qs(body).items()}
+        
+        session = self._session()
+        if route == "checkout/cart/add":
+            if form.get("product_id") == "30":
+                self._send(200, {"error": {"option": {"226": "Select required!"}}}, session)
+            else:
+                self.carts.setdefault(session, []).append(form["product_id"])
+                result = {"success": "Success: added to cart", "total": "1 item(s)"}
+                self._send(200, result, session)
+        elif route == "account/login":
+            if self.users.get(form.get("email")) == form.get("password"):
+                self._send(302, None, session, location="/index.php?route=account/account")
+            else:
+                self._send(200, "<div class='alert-danger'>Warning</div>", session)
+        else:
+            self._send(404, None, session)
+    
+    def _session(self):
+        cookie = self.headers.get("Cookie", "")
+        for part in cookie.split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "OCSESSID":
+                return value
+        return f"session{len(self.carts) + 1}"
+    
+    def _send(self, status, body, session, location=None):
+        payload = (json.dumps(body) if isinstance(body, dict) else body or "").encode()
+        self.send_response(status)
+        self.send_header("Set-Cookie", f"OCSESSID={session}; path=/")
+        if location:
+            self.send_header("Location", location)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, *args):
+        pass
+
+
+class FakeDriver:
+    
+    def __init__(self):
+        self.visited = []
+        self.cookies = []
+    
+    def get(self, url):
+        self.visited.append(url)
+    
+    def delete_all_cookies(self):
+        self.cookies = []
+    
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+
+@pytest.fixture(scope="module")
+def shop_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInShop)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestShopSeeder:
+    
+    def test_cart_is_seeded_in_one_session(self, shop_url, run_metrics):
+        seeder = ShopSeeder(shop_url, pool=create_http_pool())
+        seeder.add_to_cart(43).add_to_cart(40, quantity=2)
+        
+        assert StandInShop.carts[seeder.session_id] == ["43", "40"]
+        assert run_metrics.get("seeding.cart_items") == 2
+    
+    def test_session_cookie_moves_into_browser(self, shop_url):
+        seeder = ShopSeeder(shop_url)
+        seeder.login("john.doe.test@example.com", "TestPass123!").add_to_cart(43)
+        driver = FakeDriver()
+        
+        seeder.apply(driver)
+        
+        assert driver.visited == [f"{shop_url}/robots.txt"]
+        assert driver.cookies == [
+            {"name": "OCSESSID", "value": seeder.session_id, "path": "/", "secure": False}
+        ]
+    
+    def test_rejected_login_and_option_errors_raise(self, shop_url):
+        seeder = ShopSeeder(shop_url)
+        
+        with pytest.raises(SeedError, match="Login rejected"):
+            seeder.login("john.doe.test@example.com", "wrong")
+        with pytest.raises(SeedError, match="product 30"):
+            seeder.add_to_cart(30)
+    
+    def test_apply_without_session_raises(self):
+        with pytest.raises(SeedError):
+            ShopSeeder("http://127.0.0.1:9").apply(FakeDriver())
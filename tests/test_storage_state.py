@@ -0,0 +1,76 @@
+import pytest
+
+from utils.storage_state import StorageState, StorageStateCache
+
+
+pytestmark = pytest.mark.usefixtures("run_metrics")
+
+
+class FakeDriver:
+    
+    base_url = "https://demo.opencart.com"
+    
+    def __init__(self, logged_in=True):
+        self.logged_in = logged_in
+        self.cookies = []
+        self.visited = []
+    
+    def get(self, url):
+        self.visited.append(url)
+    
+    def get_cookies(self):
+        return list(self.cookies)
+    
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+    
+    def delete_all_cookies(self):
+        self.cookies = []
+    
+    def execute_script(self, script, *args):
+        return [{"theme": "dark"}, {}]
+    
+    def execute_async_script(self, script, *args):
+        return self.logged_in
+
+
+class TestStorageStateCache:
+    
+    @staticmethod
+    def ui_login(driver):
+        driver.cookies = [{"name": "OCSESSID", "value": "abc", "path": "/"}]
+    
+    def test_logs_in_once_and_restores_afterwards(self, run_metrics):
+        cache = StorageStateCache("https://demo.opencart.com")
+        logins = []
+        
+        def ui_login(driver):
+            logins.append(driver)
+            self.ui_login(driver)
+        
+        cache.login(FakeDriver(), "valid_user", ui_login)
+        second = FakeDriver()
+        state = cache.login(second, "valid_user", ui_login)
+        
+        assert len(logins) == 1
+        assert second.visited == ["https://demo.opencart.com/robots.txt"]
+        assert second.cookies == [{"name": "OCSESSID", "value": "abc", "path": "/"}]
+        assert state.local_storage == {"theme": "dark"}
+        assert run_metrics.get("storage_state.logins_saved") == 1
+    
+    def test_rejected_session_logs_in_again(self, run_metrics):
+        cache = StorageStateCache("https://demo.opencart.com")
+        cache.login(FakeDriver(), "valid_user", self.ui_login)
+        
+        logins = []
+        cache.login(FakeDriver(logged_in=False), "valid_user", logins.append)
+        
+        assert len(logins) == 1
+        assert run_metrics.get("storage_state.refreshes") == 1
+        assert run_metrics.get("storage_state.logins_saved") == 0
+    
+    def test_expired_cookie_skips_restore(self):
+        state = StorageState([{"name": "OCSESSID", "value": "abc", "expiry": 100}])
+        
+        assert state.is_expired(now=200)
+        assert not state.is_expired(now=50)
@@ -0,0 +1,300 @@
+import time
+
+import pytest
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    InvalidSelectorException,
+    JavascriptException,
+    NoSuchWindowException,
+    TimeoutException,
+    WebDriverException
+)
+
+from pages.cart_page import CartPage
+from utils.latency_store import LatencyStore
+from utils.wait_helpers import Condition, WaitHelpers
+
+
+pytestmark = pytest.mark.usefixtures("run_metrics")
+
+
+class FakeElement:
+    
+    def __init__(self, click_errors=0):
+        self.click_errors = click_errors
+        self.clicks = 0
+    
+    def is_displayed(self):
+        return True
+    
+    def is_enabled(self):
+        return True
+    
+    def click(self):
+        if self.click_errors:
+            self.click_errors -= 1
+            raise ElementClickInterceptedException("covered by overlay")
+        self.clicks += 1
+
+
+class FakeDriver:
+    
+    def __init__(self, element, ready_states):
+        self.element = element
+        self.ready_states = list(ready_states)
+        self.scripts = []
+    
+    def find_element(self, by, value):
+        return self.element
+    
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if "elementFromPoint" in script:
+            state = self.ready_states.pop(0) if len(self.ready_states) > 1 else self.ready_states[0]
+            return dict(state)
+        return None
+
+
+READY = {"top": 100, "left": 10, "hit": True}
+COVERED = {"top": 100, "left": 10, "hit": False}
+MOVING = {"top": 180, "left": 10, "hit": True}
+
+
+class TestSafeClick:
+    
+    def test_click_after_one_settle_poll_when_element_is_ready(self, run_metrics):
+        element = FakeElement()
+        helper = WaitHelpers(FakeDriver(element, [READY]), timeout=2)
+        
+        assert helper.safe_click(("id", "button"))
+        assert element.clicks == 1
+        assert run_metrics.get("safe_click.sleep_s") == pytest.approx(0.05)
+        assert run_metrics.get("safe_click.sleep_saved_s") == pytest.approx(0.45)
+    
+    def test_waits_while_element_is_still_moving(self, run_metrics):
+        element = FakeElement()
+        driver = FakeDriver(element, [MOVING, READY, READY])
+        helper = WaitHelpers(driver, timeout=2)
+        
+        assert helper.safe_click(("id", "button"))
+        assert element.clicks == 1
+        assert sum("elementFromPoint" in script for script in driver.scripts) == 3
+        assert run_metrics.get("safe_click.sleep_s") == pytest.approx(0.15)
+    
+    def test_waits_until_element_is_not_covered(self, run_metrics):
+        element = FakeElement()
+        driver = FakeDriver(element, [COVERED, COVERED, READY])
+        helper = WaitHelpers(driver, timeout=2)
+        
+        assert helper.safe_click(("id", "button"))
+        assert element.clicks == 1
+        assert run_metrics.get("safe_click.sleep_s") == pytest.approx(0.15)
+    
+    def test_covered_element_is_clicked_after_ready_budget(self):
+        element = FakeElement()
+        helper = WaitHelpers(FakeDriver(element, [COVERED]), timeout=20)
+        helper.CLICK_READY_BUDGET = 0.2
+        start = time.monotonic()
+        
+        assert helper.safe_click(("id", "button"))
+        assert element.clicks == 1
+        assert time.monotonic() - start < 1
+    
+    def test_intercepted_click_falls_back_to_javascript(self):
+        element = FakeElement(click_errors=1)
+        driver = FakeDriver(element, [READY])
+        helper = WaitHelpers(driver, timeout=2)
+        
+        assert helper.safe_click(("id", "button"))
+        assert driver.scripts[-1] == "arguments[0].click();"
+
+
+class TestAbsentNow:
+    
+    def test_absent_check_is_a_single_script_call(self):
+        driver = FakeDriver(FakeElement(), [READY])
+        driver.execute_script = lambda script, *args: driver.scripts.append((script, args)) or True
+        helper = WaitHelpers(driver)
+        
+        assert helper.is_absent_now(("id", "button-shipping-address"))
+        assert len(driver.scripts) == 1
+        assert driver.scripts[0][1] == ("id", "button-shipping-address")
+
+
+class TestWaitForAny:
+    
+    def make_helper(self, results):
+        driver = FakeDriver(FakeElement(), [READY])
+        calls = []
+        
+        def execute_script(script, *args):
+            calls.append(args)
+            result = results.pop(0) if len(results) > 1 else results[0]
+            if isinstance(result, Exception):
+                raise result
+            return result
+        
+        driver.execute_script = execute_script
+        return WaitHelpers(driver, timeout=1), calls
+    
+    def test_returns_index_of_matching_alternative(self):
+        helper, calls = self.make_helper([-1, -1, 1])
+        empty_message = Condition(("css selector", "#content p"), "text", "empty")
+        
+        assert helper.wait_for_any([empty_message, ("css selector", "tbody tr")]) == 1
+        assert len(calls) == 3
+        assert calls[0][0] == [
+            {"by": "css selector", "value": "#content p", "state": "text", "text": "empty",
+             "ignoreCase": True},
+            {"by": "css selector", "value": "tbody tr", "state": "present", "text": None,
+             "ignoreCase": True}
+        ]
+    
+    def test_times_out_when_nothing_matches(self):
+        helper, _ = self.make_helper([-1])
+        helper.ANY_POLL_INTERVAL = 0.05
+        
+        with pytest.raises(TimeoutException):
+            helper.wait_for_any([("id", "missing")], timeout=0.2)
+    
+    def test_replaced_document_is_polled_again(self):
+        helper, calls = self.make_helper([
+            JavascriptException("javascript error: Execution context was destroyed"),
+            0
+        ])
+        
+        assert helper.wait_for_any([("id", "content")]) == 0
+        assert len(calls) == 2
+    
+    def test_invalid_selector_is_raised_at_once(self):
+        helper, calls = self.make_helper([
+            JavascriptException("javascript error: '#content >' is not a valid selector")
+        ])
+        
+        with pytest.raises(InvalidSelectorException):
+            helper.wait_for_any([("css selector", "#content >")])
+        assert len(calls) == 1
+    
+    def test_text_condition_requires_text(self):
+        with pytest.raises(ValueError):
+            Condition(("id", "message"), "text")
+
+
+class TestNetworkIdle:
+    
+    def make_helper(self, statuses):
+        driver = FakeDriver(FakeElement(), [READY])
+        
+        def execute_script(script, *args):
+            return statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        
+        driver.execute_script = execute_script
+        helper = WaitHelpers(driver, timeout=1)
+        helper.ANY_POLL_INTERVAL = 0.01
+        return helper
+    
+    def test_waits_for_pending_requests_and_quiet_period(self):
+        statuses = [
+            {"pending": 2, "idleMs": 0},
+            {"pending": 0, "idleMs": 50},
+            {"pending": 0, "idleMs": 300}
+        ]
+        helper = self.make_helper(statuses)
+        
+        assert helper.wait_for_network_idle(quiet_ms=200) is True
+        assert statuses == [{"pending": 0, "idleMs": 300}]
+    
+    def test_times_out_while_requests_are_pending(self):
+        helper = self.make_helper([{"pending": 1, "idleMs": 5000}])
+        
+        with pytest.raises(TimeoutException, match="1 requests pending"):
+            helper.wait_for_network_idle(timeout=0.1)
+
+
+class TestObserverEngine:
+    
+    def make_helper(self, results):
+        element = FakeElement()
+        driver = FakeDriver(element, [READY])
+        calls = []
+        
+        def execute_async_script(script, *args):
+            calls.append(args)
+            result = results.pop(0) if len(results) > 1 else results[0]
+            if isinstance(result, Exception):
+                raise result
+            return result
+        
+        driver.execute_async_script = execute_async_script
+        return WaitHelpers(driver, timeout=1, engine="observer"), element, calls
+    
+    def test_visible_wait_returns_element_from_observer(self):
+        helper, element, calls = self.make_helper([{"index": 0, "element": "observed"}])
+        
+        assert helper.wait_for_element_visible(("id", "cart-total")) == "observed"
+        assert len(calls) == 1
+        assert calls[0][0][0]["state"] == "visible"
+    
+    def test_script_timeout_starts_another_observation(self):
+        helper, _, calls = self.make_helper([
+            TimeoutException("script timeout"),
+            {"index": 0, "element": None}
+        ])
+        
+        assert helper.wait_for_element_to_disappear(("id", "spinner"))
+        assert len(calls) == 2
+        assert calls[0][0][0]["state"] == "absent"
+    
+    def test_unloaded_document_is_observed_again_after_backoff(self):
+        helper, _, calls = self.make_helper([
+            JavascriptException("javascript error: document unloaded while waiting for result"),
+            {"index": 0, "element": "observed"}
+        ])
+        start = time.monotonic()
+        
+        assert helper.wait_for_element_visible(("id", "cart-total")) == "observed"
+        assert len(calls) == 2
+        assert time.monotonic() - start >= helper.ANY_POLL_INTERVAL
+    
+    def test_invalid_selector_is_raised_instead_of_retried(self):
+        helper, _, calls = self.make_helper([
+            JavascriptException("javascript error: Unsupported locator strategy: label")
+        ])
+        
+        with pytest.raises(InvalidSelectorException):
+            helper.wait_for_element_visible(("label", "Total"))
+        assert len(calls) == 1
+    
+    def test_falls_back_to_polling_when_async_scripts_fail(self):
+        helper, element, _ = self.make_helper([WebDriverException("not supported")])
+        
+        assert helper.wait_for_element_visible(("id", "cart-total")) is element
+        assert helper.driver.observer_waits_unavailable
+    
+    def test_other_driver_errors_keep_the_observer_engine(self):
+        helper, _, _ = self.make_helper([NoSuchWindowException("window already closed")])
+        
+        with pytest.raises(NoSuchWindowException):
+            helper.wait_for_element_visible(("id", "cart-total"))
+        assert not getattr(helper.driver, "observer_waits_unavailable", False)
+    
+    def test_unknown_engine_is_rejected(self):
+        with pytest.raises(ValueError):
+            WaitHelpers(FakeDriver(FakeElement(), [READY]), engine="events")
+
+
+class TestLatencyRecording:
+    
+    def test_waits_record_latency_and_use_learned_timeout(self, tmp_path):
+        store = LatencyStore(str(tmp_path / "latency.sqlite3"), adaptive=True, min_samples=1)
+        store._learned["CartPage.CHECKOUT_BUTTON:present"] = 3.5
+        driver = FakeDriver(FakeElement(), [READY])
+        driver.latency_store = store
+        helper = WaitHelpers(driver, owner=CartPage)
+        
+        assert helper._wait_time(CartPage.CHECKOUT_BUTTON, "present", None) == 3.5
+        assert helper._wait_time(CartPage.CHECKOUT_BUTTON, "present", 10) == 3.5
+        assert helper._wait_time(CartPage.CHECKOUT_BUTTON, "present", 1) == 1
+        helper.wait_for_element_present(CartPage.CHECKOUT_BUTTON)
+        
+        assert store.flush() == 1
@@ -1,37 +1,126 @@
-
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 
+from .driver_resolver import resolve_driver_path
 from .logger import get_logger
+from .network_blocker import NetworkBlocker
 
 logger = get_logger(__name__)
 
 
+DEFAULT_PROFILE = "standard"
+
+# Built-in performance profiles; config.json can add or override entries
+# under "performance_profiles". A "headless" of None follows --headless.
+# "page_load_strategy" is used unless the run sets one explicitly.
+PERFORMANCE_PROFILES = {
+    "full": {
+        "headless": None,
+        "headless_argument": "--headless",
+        "page_load_strategy": "normal",
+        "chrome_arguments": [],
+        "chrome_prefs": {},
+        "firefox_arguments": [],
+        "firefox_prefs": {}
+    },
+    "standard": {
+        "headless": None,
+        "headless_argument": "--headless",
+        "page_load_strategy": "normal",
+        "chrome_arguments": [],
+        "chrome_prefs": {
+            "profile.managed_default_content_settings.images": 2
+        },
+        "firefox_arguments": [],
+        "firefox_prefs": {
+            "permissions.default.image": 2
+        }
+    },
+    "lean": {
+        "headless": True,
+        "headless_argument": "--headless=new",
+        "page_load_strategy": "eager",
+        "chrome_arguments": [
+            "--disable-remote-fonts",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--disable-extensions",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--no-first-run",
+            "--mute-audio"
+        ],
+        "chrome_prefs": {
+            "profile.managed_default_content_settings.images": 2
+        },
+        "firefox_arguments": [],
+        "firefox_prefs": {
+            "permissions.default.image": 2,
+            "gfx.downloadable_fonts.enabled": False,
+            "network.prefetch-next": False,
+            "app.update.auto": False,
+            "extensions.update.enabled": False,
+            "browser.safebrowsing.malware.enabled": False,
+            "browser.safebrowsing.phishing.enabled": False,
+            "datareporting.healthreport.uploadEnabled": False,
+            "toolkit.telemetry.enabled": False
+        }
+    }
+}
+
+
 class DriverFactory:
     
     @staticmethod
-    def create_driver(browser="chrome", headless=False, **kwargs):
+    def get_profile(name=None, config=None):
+        config = config or {}
+        name = name or config.get("performance_profile", DEFAULT_PROFILE)
+        
+        profiles = dict(PERFORMANCE_PROFILES)
+        profiles.update(config.get("performance_profiles", {}))
+        
+        if name not in profiles:
+            raise ValueError(
+                f"Unknown performance profile: {name} (available: {', '.join(sorted(profiles))})"
+            )
+        
+        profile = dict(PERFORMANCE_PROFILES.get(name, {}))
+        profile.update(profiles[name])
+        profile["name"] = name
+        return profile
+    
+    @staticmethod
+    def create_driver(browser="chrome", headless=False, profile=None, **kwargs):
         browser = browser.lower()
-        logger.info(f"Creating {browser} driver (headless: {headless})")
+        profile = profile or DriverFactory.get_profile()
+        if profile.get("headless") is not None:
+            headless = profile["headless"]
+        
+        logger.info(f"Creating {browser} driver (headless: {headless}, "
+                    f"profile: {profile.get('name', 'custom')})")
+        
+        kwargs["page_load_strategy"] = (
+            kwargs.get("page_load_strategy") or profile.get("page_load_strategy") or "normal"
+        )
         
         if browser == "chrome":
-            return DriverFactory._create_chrome_driver(headless, **kwargs)
+            return DriverFactory._create_chrome_driver(headless, profile, **kwargs)
         elif browser == "firefox":
-            return DriverFactory._create_firefox_driver(headless, **kwargs)
+            return DriverFactory._create_firefox_driver(headless, profile, **kwargs)
         else:
             raise ValueError(f"Unsupported browser: {browser}")
     
     @staticmethod
-    def _create_chrome_driver(headless=False, **kwargs):
+    def _create_chrome_driver(headless=False, profile=None, **kwargs):
+        profile = profile or DriverFactory.get_profile()
         options = ChromeOptions()
+        options.page_load_strategy = kwargs.get("page_load_strategy") or "normal"
         
         if headless:
-            options.add_argument("--headless")
+            options.add_argument(profile.get("headless_argument", "--headless"))
         
         # Standard Chrome options for stability
         options.add_argument("--no-sandbox")
@@ -43,6 +132,11 @@ class DriverFactory:
         options.add_argument("--allow-running-insecure-content")
         options.add_argument("--disable-blink-features=AutomationControlled")
         
+        # Profile specific options
+        for option in profile.get("chrome_arguments", []):
+            if option not in options.arguments:
+                options.add_argument(option)
+        
         # Add custom options if provided
         custom_options = kwargs.get("chrome_options", [])
         for option in custom_options:
@@ -51,24 +145,34 @@ class DriverFactory:
         # Set preferences
         prefs = {
             "profile.default_content_setting_values.notifications": 2,
-            "profile.default_content_settings.popups": 0,
-            "profile.managed_default_content_settings.images": 2
+            "profile.default_content_settings.popups": 0
         }
+        prefs.update(profile.get("chrome_prefs", {}))
         options.add_experimental_option("prefs", prefs)
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
         
-        service = ChromeService(ChromeDriverManager().install())
+        blocked_urls = kwargs.get("blocked_urls") or []
+        # network_stats keeps the performance log on for tests that only block via a marker
+        if blocked_urls or kwargs.get("network_stats"):
+            NetworkBlocker.configure_chrome_options(options)
+        
+        service = ChromeService(kwargs.get("driver_path") or resolve_driver_path("chrome"))
         driver = webdriver.Chrome(service=service, options=options)
         
         # Execute script to remove webdriver property
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
+        if blocked_urls:
+            NetworkBlocker.apply(driver, blocked_urls)
+        
         return driver
     
     @staticmethod
-    def _create_firefox_driver(headless=False, **kwargs):
+    def _create_firefox_driver(headless=False, profile=None, **kwargs):
+        profile = profile or DriverFactory.get_profile()
         options = FirefoxOptions()
+        options.page_load_strategy = kwargs.get("page_load_strategy") or "normal"
         
         if headless:
             options.add_argument("--headless")
@@ -76,6 +180,10 @@ class DriverFactory:
         options.add_argument("--width=1920")
         options.add_argument("--height=1080")
         
+        # Profile specific options
+        for option in profile.get("firefox_arguments", []):
+            options.add_argument(option)
+        
         # Add custom options if provided
         custom_options = kwargs.get("firefox_options", [])
         for option in custom_options:
@@ -84,17 +192,26 @@ class DriverFactory:
         # Set preferences
         options.set_preference("dom.webnotifications.enabled", False)
         options.set_preference("media.volume_scale", "0.0")
+        for name, value in profile.get("firefox_prefs", {}).items():
+            options.set_preference(name, value)
+        for name, value in NetworkBlocker.firefox_prefs(kwargs.get("blocked_urls") or []).items():
+            options.set_preference(name, value)
         
-        service = FirefoxService(GeckoDriverManager().install())
+        service = FirefoxService(kwargs.get("driver_path") or resolve_driver_path("firefox"))
         driver = webdriver.Firefox(service=service, options=options)
         
         return driver
     
     @staticmethod
-    def configure_driver(driver, implicit_wait=10, page_load_timeout=30):
+    def configure_driver(driver, implicit_wait=10, page_load_timeout=30, script_timeout=30):
         driver.implicitly_wait(implicit_wait)
+        # Remembered so page objects can restore or skip it without a round trip
+        driver.implicit_wait = implicit_wait
         driver.set_page_load_timeout(page_load_timeout)
+        # Observer waits split long waits into chunks that fit this timeout
+        driver.set_script_timeout(script_timeout)
+        driver.script_timeout = script_timeout
         driver.maximize_window()
         
         logger.info(f"Driver configured with implicit_wait={implicit_wait}s, "
-                   f"page_load_timeout={page_load_timeout}s")
\ No newline at end of file
+                   f"page_load_timeout={page_load_timeout}s, script_timeout={script_timeout}s")
\ No newline at end of file
@@ -0,0 +1,174 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from .logger import get_logger
+from .run_metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class DriverPool:
+    
+    def __init__(self, launcher, size=1):
+        self.launcher = launcher
+        self.size = max(1, size)
+        self._idle = []
+    
+    def acquire(self):
+        while self._idle:
+            driver = self._idle.pop()
+            if self.is_alive(driver):
+                metrics.increment("driver_pool.launches_avoided")
+                logger.debug("Reusing pooled browser")
+                return driver
+            logger.warning("Pooled browser session is dead, discarding it")
+            metrics.increment("driver_pool.dead_sessions")
+            self._quit(driver)
+        
+        return self._launch()
+    
+    def release(self, driver, discard=False):
+        if discard or len(self._idle) >= self.size:
+            self._quit(driver)
+            return
+        
+        try:
+            self.reset_state(driver)
+        except WebDriverException as e:
+            logger.warning(f"Failed to reset pooled browser, it will be relaunched: {e}")
+            metrics.increment("driver_pool.reset_failures")
+            self._quit(driver)
+            return
+        
+        self._idle.append(driver)
+    
+    def close_all(self):
+        while self._idle:
+            self._quit(self._idle.pop())
+    
+    def reset_state(self, driver):
+        handles = driver.window_handles
+        main_handle = handles[0]
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(main_handle)
+        
+        origin = self._origin(getattr(driver, "base_url", None))
+        chrome = hasattr(driver, "execute_cdp_cmd")
+        # Storage and, outside Chrome, cookie deletion only reach the current origin, so a
+        # test that ended on another page would leave the store session behind
+        if origin and not chrome and self._origin(driver.current_url) != origin:
+            driver.get(f"{origin}/robots.txt")
+        
+        driver.execute_script(
+            "try { window.localStorage.clear(); } catch (e) {}"
+            "try { window.sessionStorage.clear(); } catch (e) {}"
+        )
+        
+        if chrome:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            if origin:
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"}
+                )
+        else:
+            driver.delete_all_cookies()
+        
+        driver.get("about:blank")
+        logger.debug("Pooled browser state reset")
+    
+    @staticmethod
+    def _origin(url):
+        if not url:
+            return None
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}" if parts.netloc else None
+    
+    @staticmethod
+    def is_alive(driver):
+        try:
+            driver.window_handles
+            return True
+        except WebDriverException:
+            return False
+    
+    def _launch(self):
+        driver = self.launcher()
+        metrics.increment("driver_pool.launches")
+        return driver
+    
+    @staticmethod
+    def _quit(driver):
+        try:
+            logger.info("Closing browser")
+            driver.quit()
+        except WebDriverException as e:
+            logger.warning(f"Error while closing browser: {e}")
+
+
+class StandbyDriverPool:
+    
+    def __init__(self, launcher, depth=1):
+        self.launcher = launcher
+        self.depth = max(1, depth)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.depth,
+            thread_name_prefix="standby-browser"
+        )
+        self._pending = deque()
+        self._replenish()
+    
+    def acquire(self):
+        future = self._pending.popleft()
+        # Start warming the replacement before blocking on the current one
+        self._replenish()
+        
+        if future.done():
+            metrics.increment("standby.warm_hits")
+        else:
+            metrics.increment("standby.waits")
+        
+        start = time.monotonic()
+        try:
+            driver = future.result()
+        except Exception as e:
+            logger.warning(f"Standby browser failed to launch, launching in foreground: {e}")
+            driver = self.launcher()
+        metrics.observe("standby.wait", time.monotonic() - start)
+        
+        if not DriverPool.is_alive(driver):
+            logger.warning("Standby browser session is dead, launching in foreground")
+            self._executor.submit(DriverPool._quit, driver)
+            driver = self.launcher()
+        
+        return driver
+    
+    def release(self, driver, discard=False):
+        # Standby browsers are never reused; quit off the critical path
+        self._executor.submit(DriverPool._quit, driver)
+    
+    def close_all(self):
+        while self._pending:
+            future = self._pending.popleft()
+            if future.cancel():
+                continue
+            try:
+                DriverPool._quit(future.result())
+            except Exception as e:
+                logger.warning(f"Standby browser failed during shutdown: {e}")
+        self._executor.shutdown(wait=True)
+    
+    def _replenish(self):
+        while len(self._pending) < self.depth:
+            self._pending.append(self._executor.submit(self._launch))
+    
+    def _launch(self):
+        driver = self.launcher()
+        metrics.increment("standby.launches")
+        logger.debug("Standby browser ready")
+        return driver
@@ -0,0 +1,174 @@
+import json
+import os
+import time
+from datetime import datetime
+
+from filelock import FileLock
+
+from .logger import get_logger
+from .run_metrics import metrics
+
+logger = get_logger(__name__)
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".wdm")
+MANIFEST_NAME = "driver_manifest.json"
+DEFAULT_MANIFEST_TTL_HOURS = 24
+
+
+class DriverResolver:
+    
+    def __init__(self, cache_dir=None, driver_paths=None, ttl_hours=DEFAULT_MANIFEST_TTL_HOURS):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.driver_paths = driver_paths or {}
+        self.ttl_seconds = ttl_hours * 3600
+        self.manifest_path = os.path.join(self.cache_dir, MANIFEST_NAME)
+        self.lock_path = f"{self.manifest_path}.lock"
+        self._resolved = {}
+    
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            cache_dir=config.get("driver_cache_dir"),
+            driver_paths=config.get("driver_paths"),
+            ttl_hours=config.get("driver_manifest_ttl_hours", DEFAULT_MANIFEST_TTL_HOURS)
+        )
+    
+    def resolve(self, browser):
+        browser = browser.lower()
+        
+        if browser in self._resolved:
+            return self._resolved[browser]
+        
+        configured_path = self.driver_paths.get(browser)
+        if configured_path:
+            if not os.path.isfile(configured_path):
+                raise FileNotFoundError(
+                    f"Configured {browser} driver not found: {configured_path}"
+                )
+            logger.info(f"Using configured {browser} driver: {configured_path}")
+            self._resolved[browser] = configured_path
+            return configured_path
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        browser_version = self._browser_major_version(browser)
+        
+        # Serialise resolution across xdist workers; the first worker to get the
+        # lock installs the driver and the others pick it up from the manifest
+        with FileLock(self.lock_path):
+            manifest = self._read_manifest()
+            entry = manifest.get(browser)
+            
+            if (entry and self._is_usable(entry) and self._is_fresh(entry)
+                    and self._matches_browser(entry, browser_version)):
+                logger.debug(f"Using cached {browser} driver from manifest: {entry['path']}")
+                metrics.increment("driver_resolver.manifest_hits")
+                path = entry["path"]
+            else:
+                path = self._install(browser, entry)
+                manifest[browser] = {
+                    "path": path,
+                    "browser_version": browser_version,
+                    "resolved_at": time.time(),
+                    "resolved_at_iso": datetime.now().isoformat(timespec="seconds")
+                }
+                self._write_manifest(manifest)
+        
+        self._resolved[browser] = path
+        return path
+    
+    def invalidate(self, browser):
+        # Called when the resolved driver could not start a session, e.g. after a
+        # browser update the version check did not catch
+        browser = browser.lower()
+        self._resolved.pop(browser, None)
+        if browser in self.driver_paths:
+            return
+        
+        with FileLock(self.lock_path):
+            manifest = self._read_manifest()
+            if manifest.pop(browser, None) is not None:
+                logger.info(f"Dropped cached {browser} driver from manifest")
+                self._write_manifest(manifest)
+    
+    def _install(self, browser, stale_entry=None):
+        try:
+            path = self._install_with_manager(browser)
+            metrics.increment("driver_resolver.installs")
+            logger.info(f"Resolved {browser} driver: {path}")
+            return path
+        except Exception as e:
+            if stale_entry and self._is_usable(stale_entry):
+                logger.warning(
+                    f"Driver lookup failed ({e}), falling back to cached {browser} driver: "
+                    f"{stale_entry['path']}"
+                )
+                metrics.increment("driver_resolver.offline_fallbacks")
+                return stale_entry["path"]
+            raise
+    
+    @staticmethod
+    def _install_with_manager(browser):
+        if browser == "chrome":
+            from webdriver_manager.chrome import ChromeDriverManager
+            return ChromeDriverManager().install()
+        elif browser == "firefox":
+            from webdriver_manager.firefox import GeckoDriverManager
+            return GeckoDriverManager().install()
+        else:
+            raise ValueError(f"Unsupported browser: {browser}")
+    
+    @staticmethod
+    def _browser_major_version(browser):
+        # Only chromedriver is tied to one browser major version; geckodriver supports a range
+        if browser != "chrome":
+            return None
+        try:
+            from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+            version = OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+        except Exception as e:
+            logger.debug(f"Could not read the installed {browser} version: {e}")
+            return None
+        return version.split(".")[0] if version else None
+    
+    @staticmethod
+    def _matches_browser(entry, browser_version):
+        # An unknown installed version cannot invalidate the entry
+        return browser_version is None or entry.get("browser_version") == browser_version
+    
+    def _is_fresh(self, entry):
+        return time.time() - entry.get("resolved_at", 0) < self.ttl_seconds
+    
+    @staticmethod
+    def _is_usable(entry):
+        return bool(entry.get("path")) and os.path.isfile(entry["path"])
+    
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning(f"Ignoring corrupt driver manifest: {self.manifest_path}")
+            return {}
+    
+    def _write_manifest(self, manifest):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+
+_default_resolver = None
+
+
+def get_resolver(config=None):
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = DriverResolver.from_config(config or {})
+    return _default_resolver
+
+
+def resolve_driver_path(browser, config=None):
+    return get_resolver(config).resolve(browser)
@@ -0,0 +1,76 @@
+from selenium.common.exceptions import StaleElementReferenceException
+
+from .js_locators import build_script
+from .logger import get_logger
+from .run_metrics import metrics
+
+logger = get_logger(__name__)
+
+
+# Confirms a cached element is still usable and reports the URL in the same call
+VALIDATE_SCRIPT = build_script("""
+const [element, state] = arguments;
+let ready = element.isConnected && isVisible(element);
+if (state === 'clickable') {
+    ready = ready && !element.disabled;
+}
+return [ready, location.href];
+""")
+
+
+class ElementCache:
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.hits = 0
+        self.misses = 0
+        self._elements = {}
+        # URL the cached elements were found on; taken when the first element is cached
+        self._url = None
+    
+    def get(self, locator, state="visible"):
+        element = self._elements.get(tuple(locator))
+        if element is None:
+            return self._miss()
+        
+        try:
+            ready, url = self.driver.execute_script(VALIDATE_SCRIPT, element, state)
+        except StaleElementReferenceException:
+            self.clear("stale element")
+            return self._miss()
+        
+        if url != self._url:
+            self.clear("URL changed")
+            return self._miss()
+        
+        if not ready:
+            self.discard(locator)
+            return self._miss()
+        
+        self.hits += 1
+        metrics.increment("element_cache.hits")
+        return element
+    
+    def put(self, locator, element):
+        # Taken here rather than on the first get, so a pushState or hash change in
+        # between still invalidates the entry
+        if self._url is None:
+            self._url = self.driver.current_url
+        self._elements[tuple(locator)] = element
+    
+    def discard(self, locator):
+        self._elements.pop(tuple(locator), None)
+    
+    def clear(self, reason="navigation"):
+        if self._elements:
+            logger.debug(
+                f"Element cache cleared ({reason}), dropping {len(self._elements)} elements"
+            )
+            metrics.increment("element_cache.invalidations")
+        self._elements.clear()
+        self._url = None
+    
+    def _miss(self):
+        self.misses += 1
+        metrics.increment("element_cache.misses")
+        return None
@@ -0,0 +1,51 @@
+# Browser-side equivalent of driver.find_elements for the locator strategies
+# used by the page objects, so several lookups can share one execute_script call
+FIND_ALL_FUNCTION = """
+function findAll(by, value, root) {
+    root = root || document;
+    switch (by) {
+        case 'css selector':
+            return Array.from(root.querySelectorAll(value));
+        case 'id':
+            return Array.from(root.querySelectorAll('#' + CSS.escape(value)));
+        case 'name':
+            return Array.from(root.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+        case 'class name':
+            return Array.from(root.getElementsByClassName(value));
+        case 'tag name':
+            return Array.from(root.getElementsByTagName(value));
+        case 'link text':
+            return Array.from(root.querySelectorAll('a')).filter(
+                a => a.innerText.trim() === value);
+        case 'partial link text':
+            return Array.from(root.querySelectorAll('a')).filter(
+                a => a.innerText.includes(value));
+        case 'xpath': {
+            const result = document.evaluate(
+                value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            const nodes = [];
+            for (let i = 0; i < result.snapshotLength; i++) {
+                nodes.push(result.snapshotItem(i));
+            }
+            return nodes;
+        }
+        default:
+            throw new Error('Unsupported locator strategy: ' + by);
+    }
+}
+
+function isVisible(element) {
+    if (!element.isConnected) {
+        return false;
+    }
+    const style = getComputedStyle(element);
+    if (style.visibility === 'hidden' || style.display === 'none' || style.opacity === '0') {
+        return false;
+    }
+    return element.getClientRects().length > 0;
+}
+"""
+
+
+def build_script(body):
+    return FIND_ALL_FUNCTION + body
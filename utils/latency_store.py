@@ -0,0 +1,172 @@
+import math
+import os
+import sqlite3
+import statistics
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from .logger import get_logger
+from .run_metrics import metrics
+
+logger = get_logger(__name__)
+
+
+DEFAULT_PATH = os.path.join("reports", "wait_latency.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wait_latency (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    succeeded INTEGER NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS wait_latency_key ON wait_latency (key, id);
+"""
+
+_locator_names = {}
+
+
+# Names a locator after the page class constant holding it, e.g. CartPage.CHECKOUT_BUTTON
+def locator_key(owner, locator):
+    by, value = locator
+    if owner is None:
+        return f"{by}={value}"
+    
+    cache_key = (owner, tuple(locator))
+    if cache_key not in _locator_names:
+        _locator_names[cache_key] = next(
+            (name for name in dir(owner)
+             if name.isupper() and getattr(owner, name, None) == tuple(locator)),
+            None
+        )
+    name = _locator_names[cache_key]
+    return f"{owner.__name__}.{name}" if name else f"{owner.__name__}:{by}={value}"
+
+
+class LatencyStore:
+    
+    def __init__(self, path=DEFAULT_PATH, run_id=None, adaptive=False, margin=1.0,
+                 min_samples=20, history=200, min_timeout=2, max_timeout=60,
+                 regression_factor=2.0, regression_min_delta=0.5):
+        self.path = path
+        # xdist workers of one run share this id, so their samples count as one run
+        self.run_id = run_id or os.environ.get("PYTEST_XDIST_TESTRUNUID") or uuid.uuid4().hex
+        self.adaptive = adaptive
+        self.margin = margin
+        self.min_samples = min_samples
+        self.history = history
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.regression_factor = regression_factor
+        self.regression_min_delta = regression_min_delta
+        self._pending = []
+        self._learned = {}
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+    
+    @classmethod
+    def from_config(cls, config, adaptive=None, run_id=None):
+        settings = dict(config.get("wait_latency", {}))
+        if adaptive is not None:
+            settings["adaptive"] = adaptive
+        if run_id is not None:
+            settings["run_id"] = run_id
+        settings.pop("record", None)
+        return cls(**settings)
+    
+    def record(self, key, seconds, succeeded=True):
+        # Buffered so a test run costs one write transaction per worker
+        with self._lock:
+            self._pending.append((self.run_id, key, seconds, int(succeeded), time.time()))
+    
+    def timeout_for(self, key, default):
+        if not self.adaptive:
+            return default
+        
+        with self._lock:
+            if key not in self._learned:
+                self._learned[key] = self._learn(key)
+            learned = self._learned[key]
+        
+        if learned is None:
+            return default
+        metrics.increment("wait_latency.adaptive_waits")
+        return learned
+    
+    def flush(self):
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+        
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT INTO wait_latency (run_id, key, seconds, succeeded, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        logger.debug(f"Stored {len(rows)} wait latencies in {self.path}")
+        return len(rows)
+    
+    # Locators whose median latency in this run grew well past the earlier runs' median
+    def regressions(self):
+        found = []
+        with self._connect() as connection:
+            current = self._medians(connection, "run_id = ?")
+            previous = self._medians(connection, "run_id != ?")
+        
+        for key, median in sorted(current.items()):
+            baseline = previous.get(key)
+            if baseline is None:
+                continue
+            if median > baseline * self.regression_factor and \
+                    median - baseline >= self.regression_min_delta:
+                found.append((key, baseline, median))
+        
+        metrics.increment("wait_latency.regressions", len(found))
+        for key, baseline, median in found:
+            logger.warning(f"Wait latency regression for {key}: {baseline:.2f}s -> {median:.2f}s")
+        return found
+    
+    def _learn(self, key):
+        with self._connect() as connection:
+            samples = [row[0] for row in connection.execute(
+                "SELECT seconds FROM wait_latency WHERE key = ? AND succeeded = 1 "
+                "ORDER BY id DESC LIMIT ?",
+                (key, self.history)
+            )]
+        
+        if len(samples) < self.min_samples:
+            return None
+        
+        samples.sort()
+        p99 = samples[min(math.ceil(len(samples) * 0.99), len(samples)) - 1]
+        return min(max(p99 + self.margin, self.min_timeout), self.max_timeout)
+    
+    def _medians(self, connection, run_filter):
+        samples = {}
+        for key, seconds in connection.execute(
+            f"SELECT key, seconds FROM wait_latency WHERE succeeded = 1 AND {run_filter}",
+            (self.run_id,)
+        ):
+            samples.setdefault(key, []).append(seconds)
+        return {key: statistics.median(values) for key, values in samples.items()}
+    
+    @contextmanager
+    def _connect(self):
+        # Several xdist workers may write at the end of the run; wait for the lock
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
@@ -0,0 +1,101 @@
+import json
+
+from selenium.common.exceptions import WebDriverException
+
+from .logger import get_logger
+from .run_metrics import metrics
+
+logger = get_logger(__name__)
+
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico")
+FONT_EXTENSIONS = (".woff", ".woff2", ".ttf", ".otf", ".eot")
+
+
+class NetworkBlocker:
+    
+    # Average transfer size per CDP resource type, learned from requests that
+    # were not blocked; used to estimate how many bytes blocking saved
+    _type_sizes = {}
+    
+    @staticmethod
+    def configure_chrome_options(options):
+        # Performance logs carry the Network.loadingFailed events used for counting
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {
+            "enableNetwork": True,
+            "enablePage": False
+        })
+    
+    @staticmethod
+    def firefox_prefs(patterns):
+        # Firefox has no CDP; only whole resource classes can be switched off
+        prefs = {}
+        suffixes = [pattern.rstrip("*").lower() for pattern in patterns]
+        
+        if any(suffix.endswith(IMAGE_EXTENSIONS) for suffix in suffixes):
+            prefs["permissions.default.image"] = 2
+        if any(suffix.endswith(FONT_EXTENSIONS) for suffix in suffixes):
+            prefs["gfx.downloadable_fonts.enabled"] = False
+        
+        if patterns and not prefs:
+            logger.warning("Blocked URL patterns are not supported on Firefox, ignoring them")
+        return prefs
+    
+    @staticmethod
+    def apply(driver, patterns):
+        if not hasattr(driver, "execute_cdp_cmd"):
+            logger.debug("Request blocking via CDP is not available for this browser")
+            return False
+        
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+        logger.debug(f"Blocking {len(patterns)} URL patterns")
+        return True
+    
+    @staticmethod
+    def collect_stats(driver):
+        try:
+            entries = driver.get_log("performance")
+        except (WebDriverException, ValueError, AttributeError):
+            return 0
+        
+        request_types = {}
+        blocked_types = []
+        
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+            
+            if method == "Network.responseReceived":
+                request_types[params.get("requestId")] = params.get("type", "Other")
+            elif method == "Network.loadingFinished":
+                resource_type = request_types.get(params.get("requestId"))
+                if resource_type:
+                    NetworkBlocker._record_size(resource_type, params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                blocked_types.append(params.get("type", "Other"))
+        
+        if blocked_types:
+            bytes_saved = sum(NetworkBlocker._estimate_size(t) for t in blocked_types)
+            metrics.increment("network_blocking.blocked_requests", len(blocked_types))
+            metrics.increment("network_blocking.bytes_saved_estimate", int(bytes_saved))
+            logger.debug(f"Blocked {len(blocked_types)} requests (~{int(bytes_saved)} bytes)")
+        
+        return len(blocked_types)
+    
+    @classmethod
+    def _record_size(cls, resource_type, size):
+        total, count = cls._type_sizes.get(resource_type, (0, 0))
+        cls._type_sizes[resource_type] = (total + size, count + 1)
+    
+    @classmethod
+    def _estimate_size(cls, resource_type):
+        total, count = cls._type_sizes.get(resource_type, (0, 0))
+        if count:
+            return total / count
+        
+        all_total = sum(t for t, _ in cls._type_sizes.values())
+        all_count = sum(c for _, c in cls._type_sizes.values())
+        return all_total / all_count if all_count else 0
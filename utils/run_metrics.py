@@ -0,0 +1,62 @@
+import json
+import threading
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RunMetrics:
+    
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def increment(self, name, amount=1):
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+    
+    def observe(self, name, seconds):
+        with self._lock:
+            self._values[f"{name}.count"] = self._values.get(f"{name}.count", 0) + 1
+            self._values[f"{name}.total"] = self._values.get(f"{name}.total", 0.0) + seconds
+            self._values[f"{name}.max"] = max(self._values.get(f"{name}.max", 0.0), seconds)
+    
+    def get(self, name, default=0):
+        with self._lock:
+            return self._values.get(name, default)
+    
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+    
+    def merge(self, values):
+        with self._lock:
+            for name, value in values.items():
+                if name.endswith(".max"):
+                    self._values[name] = max(self._values.get(name, 0.0), value)
+                else:
+                    self._values[name] = self._values.get(name, 0) + value
+    
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+    
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2, sort_keys=True)
+        logger.debug(f"Run metrics written to {path}")
+    
+    def format_lines(self):
+        lines = []
+        for name, value in sorted(self.snapshot().items()):
+            if isinstance(value, float):
+                lines.append(f"{name}: {value:.3f}")
+            else:
+                lines.append(f"{name}: {value}")
+        return lines
+
+
+# Process-wide metrics; each xdist worker has its own copy which the
+# controller merges at the end of the session
+metrics = RunMetrics()
@@ -0,0 +1,55 @@
+import time
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from .logger import get_logger
+from .run_metrics import metrics
+
+logger = get_logger(__name__)
+
+
+SESSION_COOKIE = "OCSESSID"
+ACCOUNT_PATH = "/index.php?route=account/account"
+
+# Requests the account page from the page's own origin so the session cookie is sent.
+# OpenCart redirects guests to the login page, which fetch reports as an opaque redirect
+# when redirects are not followed. Returns null when the page is not on the store.
+PROBE_SCRIPT = """
+const [origin, url] = arguments;
+const done = arguments[arguments.length - 1];
+if (location.origin !== origin) {
+    done(null);
+    return;
+}
+fetch(url, {credentials: 'same-origin', redirect: 'manual', cache: 'no-store'})
+    .then(response => done(response.type !== 'opaqueredirect' && response.ok))
+    .catch(() => done(null));
+"""
+
+
+class SessionProbe:
+    
+    def __init__(self, driver, base_url=None):
+        self.driver = driver
+        base_url = base_url or getattr(driver, 'base_url', 'https://demo.opencart.com')
+        parts = urlsplit(base_url)
+        self.origin = f"{parts.scheme}://{parts.netloc}"
+        self.account_url = f"{base_url.rstrip('/')}{ACCOUNT_PATH}"
+    
+    def has_session_cookie(self):
+        # Guests get a session too, so this only says whether the store has been visited
+        return self.driver.get_cookie(SESSION_COOKIE) is not None
+    
+    def is_logged_in(self):
+        start = time.monotonic()
+        try:
+            result = self.driver.execute_async_script(PROBE_SCRIPT, self.origin, self.account_url)
+        except WebDriverException as e:
+            logger.debug(f"Login state probe failed: {e}")
+            result = None
+        
+        metrics.observe("login_state.probe", time.monotonic() - start)
+        if result is None:
+            logger.debug("Login state unknown: browser is not on the store")
+        return result
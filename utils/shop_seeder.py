@@ -0,0 +1,102 @@
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .logger import get_logger
+from .run_metrics import metrics
+from .session_probe import SESSION_COOKIE
+from .storage_state import StorageState
+
+logger = get_logger(__name__)
+
+
+CART_ADD_PATH = "/index.php?route=checkout/cart/add"
+LOGIN_PATH = "/index.php?route=account/login"
+
+
+class SeedError(Exception):
+    pass
+
+
+# Connection pool shared by the seeders of one worker; each seeder keeps its own cookies
+def create_http_pool(size=4):
+    return HTTPAdapter(pool_connections=size, pool_maxsize=size)
+
+
+class ShopSeeder:
+    
+    def __init__(self, base_url, pool=None, timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.http = requests.Session()
+        self._shared_pool = pool is not None
+        if pool is not None:
+            self.http.mount("http://", pool)
+            self.http.mount("https://", pool)
+    
+    @property
+    def session_id(self):
+        return self.http.cookies.get(SESSION_COOKIE)
+    
+    def login(self, email, password):
+        logger.info(f"Seeding login for {email}")
+        response = self._post(LOGIN_PATH, {"email": email, "password": password},
+                              allow_redirects=False)
+        # A successful login redirects to the account page; a rejected one renders the form again
+        location = response.headers.get("Location", "")
+        if not response.is_redirect or "account/account" not in location:
+            raise SeedError(f"Login rejected for {email}")
+        return self
+    
+    def add_to_cart(self, product_id, quantity=1, options=None):
+        data = {"product_id": product_id, "quantity": quantity}
+        for option_id, value in (options or {}).items():
+            data[f"option[{option_id}]"] = value
+        
+        logger.info(f"Seeding cart with product {product_id} (quantity: {quantity})")
+        response = self._post(CART_ADD_PATH, data)
+        try:
+            result = response.json()
+        except ValueError:
+            raise SeedError(f"Cart add for product {product_id} did not return JSON")
+        
+        if "success" not in result:
+            # Products with required options answer with errors (or a redirect) instead
+            raise SeedError(f"Cart add for product {product_id} failed: {result}")
+        metrics.increment("seeding.cart_items")
+        return self
+    
+    def apply(self, driver):
+        # Moves the seeded session into the browser; the next page load sees the cart and login
+        if self.session_id is None:
+            raise SeedError("Nothing seeded yet, there is no session cookie to transfer")
+        
+        cookies = [
+            {"name": cookie.name, "value": cookie.value, "path": cookie.path or "/",
+             "secure": bool(cookie.secure)}
+            for cookie in self.http.cookies
+        ]
+        StorageState(cookies).apply(driver, self.base_url)
+        metrics.increment("seeding.sessions_applied")
+    
+    def close(self):
+        # Closing the session would also close the shared pool's connections
+        if self._shared_pool:
+            self.http.cookies.clear()
+        else:
+            self.http.close()
+    
+    def _post(self, path, data, allow_redirects=True):
+        start = time.monotonic()
+        try:
+            response = self.http.post(f"{self.base_url}{path}", data=data,
+                                      timeout=self.timeout, allow_redirects=allow_redirects)
+        except requests.RequestException as e:
+            raise SeedError(f"Request to {path} failed: {e}") from e
+        finally:
+            metrics.observe("seeding.request", time.monotonic() - start)
+        
+        if response.status_code >= 400:
+            raise SeedError(f"Request to {path} returned HTTP {response.status_code}")
+        return response
@@ -0,0 +1,93 @@
+import time
+from urllib.parse import urlsplit
+
+from .logger import get_logger
+from .run_metrics import metrics
+from .session_probe import SessionProbe
+
+logger = get_logger(__name__)
+
+
+# Cookies can only be set for the page's current domain, and storage belongs to the origin.
+# A static file keeps the page load that gets the browser there cheap.
+LANDING_PATH = "/robots.txt"
+
+CAPTURE_STORAGE_SCRIPT = """
+const read = storage => {
+    const items = {};
+    for (let i = 0; i < storage.length; i++) {
+        const key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+};
+return [read(window.localStorage), read(window.sessionStorage)];
+"""
+
+RESTORE_STORAGE_SCRIPT = """
+const [local, session] = arguments;
+Object.entries(local).forEach(([key, value]) => window.localStorage.setItem(key, value));
+Object.entries(session).forEach(([key, value]) => window.sessionStorage.setItem(key, value));
+"""
+
+
+class StorageState:
+    
+    def __init__(self, cookies, local_storage=None, session_storage=None):
+        self.cookies = cookies
+        self.local_storage = local_storage or {}
+        self.session_storage = session_storage or {}
+        self.captured_at = time.time()
+    
+    @classmethod
+    def capture(cls, driver):
+        local_storage, session_storage = driver.execute_script(CAPTURE_STORAGE_SCRIPT)
+        return cls(driver.get_cookies(), local_storage, session_storage)
+    
+    def is_expired(self, now=None):
+        now = now or time.time()
+        return any(cookie.get("expiry") is not None and cookie["expiry"] <= now
+                   for cookie in self.cookies)
+    
+    def apply(self, driver, base_url):
+        parts = urlsplit(base_url)
+        driver.get(f"{parts.scheme}://{parts.netloc}{LANDING_PATH}")
+        driver.delete_all_cookies()
+        for cookie in self.cookies:
+            driver.add_cookie(cookie)
+        if self.local_storage or self.session_storage:
+            driver.execute_script(RESTORE_STORAGE_SCRIPT, self.local_storage, self.session_storage)
+
+
+class StorageStateCache:
+    
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self._states = {}
+    
+    def login(self, driver, user_key, ui_login):
+        # ui_login(driver) logs in through the pages; it runs once per user until the
+        # saved session expires
+        state = self._states.get(user_key)
+        if state is not None and not state.is_expired():
+            state.apply(driver, self.base_url)
+            if SessionProbe(driver, self.base_url).is_logged_in():
+                logger.debug(f"Restored saved session for {user_key}")
+                metrics.increment("storage_state.logins_saved")
+                return state
+            logger.info(f"Saved session for {user_key} was rejected by the store, logging in again")
+            driver.delete_all_cookies()
+        
+        if state is not None:
+            metrics.increment("storage_state.refreshes")
+        
+        start = time.monotonic()
+        ui_login(driver)
+        metrics.observe("storage_state.ui_login", time.monotonic() - start)
+        
+        state = StorageState.capture(driver)
+        self._states[user_key] = state
+        return state
+    
+    def forget(self, user_key):
+        self._states.pop(user_key, None)
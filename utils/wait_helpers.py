@@ -5,53 +5,296 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import (
     TimeoutException, 
+    JavascriptException,
+    WebDriverException,
     StaleElementReferenceException,
     ElementClickInterceptedException,
-    ElementNotInteractableException
+    ElementNotInteractableException,
+    InvalidSelectorException,
+    UnknownMethodException
 )
 from selenium.webdriver.common.action_chains import ActionChains
 
+from .js_locators import build_script
+from .latency_store import locator_key
 from .logger import get_logger
+from .run_metrics import metrics
 
 logger = get_logger(__name__)
 
 
+# Scrolls the element to the centre of the viewport, ignoring any smooth-scroll style,
+# and reports its position and whether it is the topmost node at its centre
+CLICK_READY_SCRIPT = """
+const element = arguments[0];
+element.scrollIntoView({behavior: 'instant', block: 'center', inline: 'center'});
+const rect = element.getBoundingClientRect();
+const topmost = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+return {
+    top: rect.top,
+    left: rect.left,
+    hit: !!topmost && (topmost === element || element.contains(topmost))
+};
+"""
+
+IS_ABSENT_SCRIPT = build_script("return findAll(arguments[0], arguments[1]).length === 0;")
+
+# Returns the element satisfying a condition, true for "absent", or null
+MATCH_CONDITION_FUNCTION = """
+function matchCondition(c) {
+    const elements = findAll(c.by, c.value);
+    if (c.state === 'absent') {
+        return elements.length === 0 ? true : null;
+    }
+    if (c.state === 'present') {
+        return elements.length ? elements[0] : null;
+    }
+    if (c.state === 'visible') {
+        return elements.find(isVisible) || null;
+    }
+    if (c.state === 'clickable') {
+        return elements.find(e => isVisible(e) && !e.disabled) || null;
+    }
+    const wanted = c.ignoreCase ? c.text.toLowerCase() : c.text;
+    return elements.find(e => {
+        const text = c.ignoreCase ? e.innerText.toLowerCase() : e.innerText;
+        return isVisible(e) && text.includes(wanted);
+    }) || null;
+}
+
+function firstMatch(conditions) {
+    for (let i = 0; i < conditions.length; i++) {
+        const match = matchCondition(conditions[i]);
+        if (match) {
+            return {index: i, element: match === true ? null : match};
+        }
+    }
+    return null;
+}
+"""
+
+# Evaluates every alternative in one call and returns the index of the first match
+WAIT_FOR_ANY_SCRIPT = build_script(MATCH_CONDITION_FUNCTION + """
+const match = firstMatch(arguments[0]);
+return match ? match.index : -1;
+""")
+
+# Resolves as soon as a DOM mutation makes one of the conditions true. The interval
+# catches changes that are not mutations, such as CSS transitions finishing.
+OBSERVE_SCRIPT = build_script(MATCH_CONDITION_FUNCTION + """
+const conditions = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+
+const initial = firstMatch(conditions);
+if (initial) {
+    done(initial);
+    return;
+}
+
+let finished = false;
+const observer = new MutationObserver(check);
+const interval = setInterval(check, 100);
+const timer = setTimeout(() => finish(null), timeoutMs);
+observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+
+function check() {
+    const match = firstMatch(conditions);
+    if (match) {
+        finish(match);
+    }
+}
+
+function finish(result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    done(result);
+}
+""")
+
+# Counts in-flight XHR and fetch requests, installing the hooks once per document, and
+# reports the larger of that count and jQuery.active (which also covers requests that
+# started before the hooks went in) along with the time since the last request event
+NETWORK_STATUS_SCRIPT = """
+if (!window.__networkTracker) {
+    const tracker = {pending: 0, last: performance.now()};
+    const started = () => { tracker.pending++; tracker.last = performance.now(); };
+    const finished = () => {
+        tracker.pending = Math.max(tracker.pending - 1, 0);
+        tracker.last = performance.now();
+    };
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        started();
+        this.addEventListener('loadend', finished, {once: true});
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function () {
+            started();
+            return fetch.apply(this, arguments).finally(finished);
+        };
+    }
+    window.__networkTracker = tracker;
+}
+const tracker = window.__networkTracker;
+const active = window.jQuery ? window.jQuery.active : 0;
+return {pending: Math.max(tracker.pending, active), idleMs: performance.now() - tracker.last};
+"""
+
+
+# Script errors chromedriver and geckodriver report when the document is replaced
+# while a script runs; any other script error is a problem with the locator itself
+DOCUMENT_REPLACED_MESSAGES = (
+    "document unloaded",
+    "document was unloaded",
+    "execution context was destroyed",
+    "cannot find context"
+)
+
+
+def is_document_replaced(error):
+    message = (getattr(error, "msg", None) or str(error)).lower()
+    return any(text in message for text in DOCUMENT_REPLACED_MESSAGES)
+
+
+# Errors meaning the driver cannot run async scripts at all, as opposed to a closed
+# window, an open alert or a lost session
+ASYNC_UNSUPPORTED_MESSAGES = (
+    "unknown command",
+    "unsupported",
+    "not supported",
+    "not implemented"
+)
+
+
+def async_scripts_unsupported(error):
+    if isinstance(error, UnknownMethodException):
+        return True
+    message = (getattr(error, "msg", None) or str(error)).lower()
+    return any(text in message for text in ASYNC_UNSUPPORTED_MESSAGES)
+
+
+def locator_script_error(error, conditions):
+    # Surfaces a bad selector, XPath or strategy the way find_element would
+    return InvalidSelectorException(f"Locator script failed for {conditions}: {error.msg}")
+
+
+class ObserverUnavailable(Exception):
+    pass
+
+
+class Condition:
+    
+    STATES = ("present", "visible", "clickable", "absent", "text")
+    
+    __slots__ = ("locator", "state", "text", "ignore_case")
+    
+    def __init__(self, locator, state="present", text=None, ignore_case=True):
+        if state not in self.STATES:
+            raise ValueError(f"Unsupported condition state: {state}")
+        if state == "text" and text is None:
+            raise ValueError("A text condition needs the text to look for")
+        self.locator = locator
+        self.state = state
+        self.text = text
+        self.ignore_case = ignore_case
+    
+    @classmethod
+    def of(cls, alternative):
+        # Plain locators mean "present", matching wait_for_element_present
+        return alternative if isinstance(alternative, cls) else cls(alternative)
+    
+    def to_script_arg(self):
+        by, value = self.locator
+        return {
+            "by": by,
+            "value": value,
+            "state": self.state,
+            "text": self.text,
+            "ignoreCase": self.ignore_case
+        }
+    
+    def __repr__(self):
+        text = f", {self.text!r}" if self.text is not None else ""
+        return f"Condition({self.locator}, {self.state}{text})"
+
+
 class WaitHelpers:
     
-    def __init__(self, driver, timeout=20):
+    CLICK_SETTLE_POLL = 0.05
+    # Time spent waiting for the element to settle before clicking anyway; a click
+    # that still lands on something else goes to the JavaScript fallback
+    CLICK_READY_BUDGET = 1.0
+    CLICK_BACKOFF_INITIAL = 0.1
+    CLICK_BACKOFF_MAX = 1.0
+    ANY_POLL_INTERVAL = 0.1
+    # Time without request activity that counts as idle; covers OpenCart's follow-up
+    # requests, such as reloading the header cart after an add
+    NETWORK_QUIET_MS = 300
+    
+    ENGINES = ("polling", "observer")
+    # Head room left under the driver's script timeout for each observer call
+    SCRIPT_TIMEOUT_MARGIN = 1.0
+    
+    def __init__(self, driver, timeout=20, engine=None, owner=None):
         self.driver = driver
         self.wait = WebDriverWait(driver, timeout)
         self.timeout = timeout
+        self.engine = engine or getattr(driver, 'wait_engine', 'polling')
+        # Page class the waits belong to; names locators in the latency store
+        self.owner = owner
+        self.latency_store = getattr(driver, 'latency_store', None)
+        # Set by pages that opt in to reusing located elements
+        self.element_cache = None
+        if self.engine not in self.ENGINES:
+            raise ValueError(f"Unsupported wait engine: {self.engine}")
     
     def wait_for_element_visible(self, locator, timeout=None):
-        wait_time = timeout or self.timeout
+        element = self._cached(locator, "visible")
+        if element is not None:
+            return element
+        
+        wait_time = self._wait_time(locator, "visible", timeout)
         try:
-            element = WebDriverWait(self.driver, wait_time).until(
-                EC.visibility_of_element_located(locator)
+            element = self._until(
+                Condition(locator, "visible"), wait_time, EC.visibility_of_element_located(locator)
             )
             logger.debug(f"Element visible: {locator}")
-            return element
+            return self._remember(locator, element)
         except TimeoutException:
             logger.error(f"Element not visible within {wait_time}s: {locator}")
             raise
     
     def wait_for_element_clickable(self, locator, timeout=None):
-        wait_time = timeout or self.timeout
+        element = self._cached(locator, "clickable")
+        if element is not None:
+            return element
+        
+        wait_time = self._wait_time(locator, "clickable", timeout)
         try:
-            element = WebDriverWait(self.driver, wait_time).until(
-                EC.element_to_be_clickable(locator)
+            element = self._until(
+                Condition(locator, "clickable"), wait_time, EC.element_to_be_clickable(locator)
             )
             logger.debug(f"Element clickable: {locator}")
-            return element
+            return self._remember(locator, element)
         except TimeoutException:
             logger.error(f"Element not clickable within {wait_time}s: {locator}")
             raise
     
     def wait_for_element_present(self, locator, timeout=None):
-        wait_time = timeout or self.timeout
+        wait_time = self._wait_time(locator, "present", timeout)
         try:
-            element = WebDriverWait(self.driver, wait_time).until(
-                EC.presence_of_element_located(locator)
+            element = self._until(
+                Condition(locator, "present"), wait_time, EC.presence_of_element_located(locator)
             )
             logger.debug(f"Element present: {locator}")
             return element
@@ -60,9 +303,11 @@ class WaitHelpers:
             raise
     
     def wait_for_text_in_element(self, locator, text, timeout=None):
-        wait_time = timeout or self.timeout
+        wait_time = self._wait_time(locator, "text", timeout)
         try:
-            result = WebDriverWait(self.driver, wait_time).until(
+            result = self._until(
+                Condition(locator, "text", text, ignore_case=False),
+                wait_time,
                 EC.text_to_be_present_in_element(locator, text)
             )
             logger.debug(f"Text '{text}' found in element: {locator}")
@@ -83,11 +328,41 @@ class WaitHelpers:
             logger.error(f"URL does not contain '{url_fragment}' within {wait_time}s")
             raise
     
-    def wait_for_element_to_disappear(self, locator, timeout=None):
+    def track_network(self):
+        # Call before an action so requests it starts are counted from the beginning
+        return self.driver.execute_script(NETWORK_STATUS_SCRIPT)
+    
+    def wait_for_network_idle(self, quiet_ms=None, timeout=None):
+        quiet_ms = self.NETWORK_QUIET_MS if quiet_ms is None else quiet_ms
         wait_time = timeout or self.timeout
+        start = time.monotonic()
+        deadline = start + wait_time
+        
+        while True:
+            try:
+                status = self.driver.execute_script(NETWORK_STATUS_SCRIPT)
+            except JavascriptException:
+                # The action navigated; the next poll installs the tracker in the new document
+                status = None
+            
+            if status is not None and status["pending"] == 0 and status["idleMs"] >= quiet_ms:
+                metrics.observe("network_idle", time.monotonic() - start)
+                logger.debug(f"Network idle after {time.monotonic() - start:.2f}s")
+                return True
+            if time.monotonic() + self.ANY_POLL_INTERVAL > deadline:
+                pending = status["pending"] if status else "unknown"
+                logger.error(f"Network not idle within {wait_time}s ({pending} requests pending)")
+                raise TimeoutException(f"Network not idle: {pending} requests pending")
+            time.sleep(self.ANY_POLL_INTERVAL)
+    
+    def wait_for_element_to_disappear(self, locator, timeout=None):
+        wait_time = self._wait_time(locator, "absent", timeout)
         try:
-            result = WebDriverWait(self.driver, wait_time).until_not(
-                EC.presence_of_element_located(locator)
+            result = self._until(
+                Condition(locator, "absent"),
+                wait_time,
+                EC.presence_of_element_located(locator),
+                negate=True
             )
             logger.debug(f"Element disappeared: {locator}")
             return result
@@ -95,58 +370,260 @@ class WaitHelpers:
             logger.error(f"Element still present after {wait_time}s: {locator}")
             raise
     
-    def safe_click(self, locator, timeout=None, retries=3):
+    def wait_for_any(self, alternatives, timeout=None):
         wait_time = timeout or self.timeout
+        conditions = [Condition.of(alternative) for alternative in alternatives]
+        payload = [condition.to_script_arg() for condition in conditions]
+        deadline = time.monotonic() + wait_time
         
-        for attempt in range(retries):
+        if self._observer_enabled():
             try:
-                element = self.wait_for_element_clickable(locator, wait_time)
-                
-                # Scroll element into view
-                self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                time.sleep(0.5)  # Brief pause after scroll
-                
-                # Try regular click first
-                element.click()
-                logger.debug(f"Successfully clicked element: {locator}")
-                return True
-                
-            except (ElementClickInterceptedException, ElementNotInteractableException) as e:
-                logger.warning(f"Click intercepted on attempt {attempt + 1}: {e}")
-                
-                if attempt < retries - 1:
-                    # Try JavaScript click as fallback
-                    try:
-                        element = self.wait_for_element_present(locator, wait_time)
-                        self.driver.execute_script("arguments[0].click();", element)
-                        logger.debug(f"JavaScript click successful: {locator}")
-                        return True
-                    except Exception as js_error:
-                        logger.warning(f"JavaScript click failed: {js_error}")
-                        time.sleep(1)  # Wait before retry
-                else:
+                index, _ = self._observe(conditions, wait_time)
+                logger.debug(f"Condition {index} matched: {conditions[index]}")
+                return index
+            except ObserverUnavailable:
+                pass
+        
+        while True:
+            try:
+                index = self.driver.execute_script(WAIT_FOR_ANY_SCRIPT, payload)
+            except JavascriptException as e:
+                if not is_document_replaced(e):
+                    raise locator_script_error(e, conditions) from e
+                # Document replaced mid-evaluation; try again on the next poll
+                index = -1
+            
+            if index >= 0:
+                logger.debug(f"Condition {index} matched: {conditions[index]}")
+                return index
+            if time.monotonic() + self.ANY_POLL_INTERVAL > deadline:
+                logger.error(f"None of the conditions matched within {wait_time}s: {conditions}")
+                raise TimeoutException(f"None of the conditions matched: {conditions}")
+            time.sleep(self.ANY_POLL_INTERVAL)
+    
+    def wait_for_document_ready(self, timeout=None):
+        wait_time = timeout or self.timeout
+        try:
+            result = WebDriverWait(self.driver, wait_time).until(
+                lambda driver: driver.execute_script("return document.readyState") != "loading"
+            )
+            logger.debug("Document is interactive")
+            return result
+        except TimeoutException:
+            logger.error(f"Document not interactive within {wait_time}s")
+            raise
+    
+    def _cached(self, locator, state):
+        if self.element_cache is None:
+            return None
+        return self.element_cache.get(locator, state)
+    
+    def _remember(self, locator, element):
+        if self.element_cache is not None and element is not None:
+            self.element_cache.put(locator, element)
+        return element
+    
+    def _wait_time(self, locator, state, timeout):
+        wait_time = timeout or self.timeout
+        if self.latency_store is None:
+            return wait_time
+        
+        learned = self.latency_store.timeout_for(self._latency_key(locator, state), wait_time)
+        # A learned value replaces the default but may only shorten an explicit timeout,
+        # so short presence probes stay short
+        return learned if not timeout else min(timeout, learned)
+    
+    def _latency_key(self, locator, state):
+        return f"{locator_key(self.owner, locator)}:{state}"
+    
+    def _until(self, condition, wait_time, expected_condition, negate=False):
+        start = time.monotonic()
+        try:
+            result = self._satisfy(condition, wait_time, expected_condition, negate)
+        except TimeoutException:
+            self._record_latency(condition, start, False)
+            raise
+        self._record_latency(condition, start, True)
+        return result
+    
+    def _satisfy(self, condition, wait_time, expected_condition, negate):
+        if self._observer_enabled():
+            try:
+                _, element = self._observe([condition], wait_time)
+                return element if element is not None else True
+            except ObserverUnavailable:
+                pass
+        
+        wait = WebDriverWait(self.driver, wait_time)
+        if negate:
+            return wait.until_not(expected_condition)
+        return wait.until(expected_condition)
+    
+    def _record_latency(self, condition, start, succeeded):
+        if self.latency_store is None:
+            return
+        key = self._latency_key(condition.locator, condition.state)
+        self.latency_store.record(key, time.monotonic() - start, succeeded)
+    
+    def _observer_enabled(self):
+        return self.engine == "observer" and not getattr(
+            self.driver, 'observer_waits_unavailable', False
+        )
+    
+    def _observe(self, conditions, wait_time):
+        payload = [condition.to_script_arg() for condition in conditions]
+        deadline = time.monotonic() + wait_time
+        script_timeout = getattr(self.driver, 'script_timeout', 30)
+        chunk_limit = max(script_timeout - self.SCRIPT_TIMEOUT_MARGIN, self.ANY_POLL_INTERVAL)
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(f"None of the conditions matched: {conditions}")
+            
+            chunk_ms = int(min(remaining, chunk_limit) * 1000)
+            try:
+                result = self.driver.execute_async_script(OBSERVE_SCRIPT, payload, chunk_ms)
+            except TimeoutException:
+                # Script timeout reported by the driver; the next chunk picks up
+                continue
+            except JavascriptException as e:
+                if not is_document_replaced(e):
+                    raise locator_script_error(e, conditions) from e
+                # The document unloaded while observing; observe the new one once it loads
+                logger.debug(f"Observer wait interrupted, retrying: {e}")
+                time.sleep(min(self.ANY_POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+                continue
+            except WebDriverException as e:
+                if not async_scripts_unsupported(e):
                     raise
+                # Stays set on the driver, so only for errors that will not go away
+                logger.warning(f"Async scripts unavailable, falling back to polling waits: {e}")
+                self.driver.observer_waits_unavailable = True
+                raise ObserverUnavailable() from e
+            
+            metrics.increment("observer_waits.calls")
+            if result is not None:
+                return result["index"], result.get("element")
+    
+    def is_absent_now(self, locator):
+        # Single round trip that is not affected by the implicit wait
+        absent = self.driver.execute_script(IS_ABSENT_SCRIPT, *locator)
+        logger.debug(f"Element absent now: {locator} -> {absent}")
+        return absent
+    
+    def safe_click(self, locator, timeout=None, retries=3):
+        wait_time = timeout or self.timeout
+        deadline = time.monotonic() + wait_time
+        delay = self.CLICK_BACKOFF_INITIAL
+        # Sleeps the previous fixed-delay implementation would have taken
+        legacy_sleep = 0.0
+        slept = 0.0
+        
+        try:
+            for attempt in range(retries):
+                try:
+                    element = self.wait_for_element_clickable(
+                        locator, max(deadline - time.monotonic(), self.CLICK_BACKOFF_INITIAL)
+                    )
                     
-            except StaleElementReferenceException:
-                logger.warning(f"Stale element on attempt {attempt + 1}, retrying: {locator}")
-                if attempt == retries - 1:
-                    raise
-                time.sleep(0.5)
+                    # Scroll element into view and wait until nothing covers it
+                    legacy_sleep += 0.5
+                    slept += self._wait_until_click_ready(element, deadline)
+                    
+                    # Try regular click first
+                    element.click()
+                    logger.debug(f"Successfully clicked element: {locator}")
+                    return True
                 
-        return False
+                except (ElementClickInterceptedException, ElementNotInteractableException) as e:
+                    logger.warning(f"Click intercepted on attempt {attempt + 1}: {e}")
+                    
+                    if attempt < retries - 1:
+                        # Try JavaScript click as fallback
+                        try:
+                            element = self.wait_for_element_present(locator, wait_time)
+                            self.driver.execute_script("arguments[0].click();", element)
+                            logger.debug(f"JavaScript click successful: {locator}")
+                            return True
+                        except Exception as js_error:
+                            logger.warning(f"JavaScript click failed: {js_error}")
+                            legacy_sleep += 1
+                            slept += self._backoff(delay, deadline)
+                            delay *= 2
+                    else:
+                        raise
+                
+                except StaleElementReferenceException:
+                    logger.warning(f"Stale element on attempt {attempt + 1}, retrying: {locator}")
+                    if self.element_cache is not None:
+                        self.element_cache.clear("stale element")
+                    if attempt == retries - 1:
+                        raise
+                    legacy_sleep += 0.5
+                    slept += self._backoff(delay, deadline)
+                    delay *= 2
+            
+            return False
+        finally:
+            metrics.increment("safe_click.clicks")
+            metrics.increment("safe_click.sleep_s", slept)
+            metrics.increment("safe_click.sleep_saved_s", max(legacy_sleep - slept, 0.0))
+    
+    def _wait_until_click_ready(self, element, deadline):
+        deadline = min(deadline, time.monotonic() + self.CLICK_READY_BUDGET)
+        slept = 0.0
+        delay = self.CLICK_SETTLE_POLL
+        last_position = None
+        
+        while True:
+            state = self.driver.execute_script(CLICK_READY_SCRIPT, element)
+            # Still moving (an animation or late layout shift) until two polls agree
+            position = (state["top"], state["left"])
+            settled = position == last_position
+            
+            if state["hit"] and settled:
+                return slept
+            if time.monotonic() + delay > deadline:
+                logger.debug("Element not confirmed clickable in time, clicking anyway")
+                return slept
+            
+            last_position = position
+            time.sleep(delay)
+            slept += delay
+            delay = min(delay * 2, self.CLICK_BACKOFF_MAX)
+    
+    def _backoff(self, delay, deadline):
+        delay = min(delay, self.CLICK_BACKOFF_MAX, max(deadline - time.monotonic(), 0))
+        time.sleep(delay)
+        return delay
     
     def safe_send_keys(self, locator, text, clear_first=True, timeout=None):
         wait_time = timeout or self.timeout
-        element = self.wait_for_element_visible(locator, wait_time)
         
-        if clear_first:
-            element.clear()
+        for attempt in range(2):
+            element = self.wait_for_element_visible(locator, wait_time)
+            try:
+                if clear_first:
+                    element.clear()
+                element.send_keys(text)
+                break
+            except StaleElementReferenceException:
+                if self.element_cache is None or attempt:
+                    raise
+                # The cached handle went stale without a navigation; locate it afresh
+                self.element_cache.clear("stale element")
         
-        element.send_keys(text)
         logger.debug(f"Sent keys to element: {locator}")
     
     def wait_and_get_text(self, locator, timeout=None):
         element = self.wait_for_element_visible(locator, timeout)
-        text = element.text.strip()
+        try:
+            text = element.text.strip()
+        except StaleElementReferenceException:
+            if self.element_cache is None:
+                raise
+            self.element_cache.clear("stale element")
+            text = self.wait_for_element_visible(locator, timeout).text.strip()
         logger.debug(f"Got text from element {locator}: {text}")
         return text
\ No newline at end of file